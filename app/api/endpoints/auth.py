@@ -1,16 +1,20 @@
 """Authentication endpoints."""
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
 
 from app.core.database import get_db
+from app.core.login_throttle import login_throttle
+from app.core.rate_limit import client_ip
+from app.core.refresh_tokens import refresh_token_store
 from app.core.security import (
-    verify_password, get_password_hash,
-    create_access_token, create_refresh_token,
+    verify_password_async, get_password_hash_async, create_access_token,
 )
 from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
+from app.schemas.user import UserCreate, UserResponse, UserLogin, Token, RefreshRequest
+from app.services.users import unique_violation_column
 
 router = APIRouter()
 
@@ -20,41 +24,44 @@ async def register(
     user_data: UserCreate,
     db: AsyncSession = Depends(get_db),
 ):
-    """Register a new user."""
-    # Check if email already exists
-    result = await db.execute(
-        select(User).where(User.email == user_data.email)
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
-
-    # Check if username already exists
-    result = await db.execute(
-        select(User).where(User.username == user_data.username)
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken",
-        )
+    """
+    Register a new user.
 
-    # Create new user
-    new_user = User(
-        email=user_data.email,
-        username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
-        full_name=user_data.full_name,
-        phone=user_data.phone,
-        bio=user_data.bio,
-        location=user_data.location,
-    )
+    A single INSERT ... RETURNING; duplicates are detected by the unique
+    indexes on email and username instead of separate SELECTs.
+    """
+    hashed_password = await get_password_hash_async(user_data.password)
 
-    db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)
+    try:
+        result = await db.execute(
+            insert(User)
+            .values(
+                email=user_data.email,
+                username=user_data.username,
+                hashed_password=hashed_password,
+                full_name=user_data.full_name,
+                phone=user_data.phone,
+                bio=user_data.bio,
+                location=user_data.location,
+            )
+            .returning(User)
+        )
+        new_user = result.scalar_one()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        field = unique_violation_column(e)
+        if field == "email":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered",
+            ) from e
+        if field == "username":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already taken",
+            ) from e
+        raise
 
     return new_user
 
@@ -62,9 +69,21 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     credentials: UserLogin,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """Login and get access token."""
+    ip = client_ip(request.scope)
+
+    # Reject locked-out emails/IPs before the DB lookup and bcrypt
+    retry_after = await login_throttle.check(credentials.email, ip)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts",
+            headers={"Retry-After": str(retry_after)},
+        )
+
     # Find user by email
     result = await db.execute(
         select(User).where(User.email == credentials.email)
@@ -72,7 +91,8 @@ async def login(
     user = result.scalar_one_or_none()
 
     # Verify credentials
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await verify_password_async(credentials.password, user.hashed_password):
+        await login_throttle.record_failure(credentials.email, ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -84,15 +104,40 @@ async def login(
             detail="Account is inactive",
         )
 
+    await login_throttle.reset(credentials.email)
+
     # Update last login
     user.last_login = datetime.utcnow()
     await db.commit()
 
     # Create tokens
     access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    refresh_token = await refresh_token_store.issue(user.id)
 
     return Token(
         access_token=access_token,
         refresh_token=refresh_token,
     )
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(request_data: RefreshRequest):
+    """
+    Exchange a refresh token for a new access/refresh token pair.
+
+    The presented refresh token is rotated and cannot be used again;
+    replaying it revokes the whole token family.
+    """
+    user_id, refresh_token = await refresh_token_store.rotate(request_data.refresh_token)
+    access_token = create_access_token(data={"sub": str(user_id)})
+
+    return Token(
+        access_token=access_token,
+        refresh_token=refresh_token,
+    )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(request_data: RefreshRequest):
+    """Revoke the refresh token family so it can no longer be refreshed."""
+    await refresh_token_store.revoke(request_data.refresh_token)
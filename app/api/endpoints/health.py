@@ -1,10 +1,11 @@
 """Health check endpoints."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from app.core.database import get_db
-from app.core.redis import get_redis, RedisClient
+from app.core.database import get_db, replica_set
+from app.core.redis import breaker, get_redis, RedisClient
+from app.core.warmup import warmup
 
 router = APIRouter()
 
@@ -17,14 +18,16 @@ async def health_check():
 
 @router.get("/health/ready")
 async def readiness_check(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     redis: RedisClient = Depends(get_redis),
 ):
     """
-    Readiness check - verify all dependencies are available.
-    Used by Kubernetes readiness probe.
+    Readiness check - verify all dependencies are available and startup
+    warmup has finished. Used by Kubernetes readiness probe.
     """
     checks = {
+        "warmup": "healthy" if warmup.ready else "unhealthy: in progress",
         "database": "unknown",
         "redis": "unknown",
     }
@@ -46,12 +49,33 @@ async def readiness_check(
     except Exception as e:
         checks["redis"] = f"unhealthy: {str(e)}"
 
-    # Overall status
-    is_healthy = all(status == "healthy" for status in checks.values())
+    # Overall status. Every Redis caller fails open (see app.core.redis),
+    # so the API keeps serving without it, slower and with token refresh
+    # unavailable, rather than dropping every pod out of rotation
+    is_healthy = all(
+        check == "healthy" for name, check in checks.items() if name != "redis"
+    )
+    if not is_healthy:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    # Replicas are informational: reads fall back to the primary without them
+    replicas = {
+        replica.name: {"healthy": replica.healthy, "lag_seconds": replica.lag}
+        for replica in replica_set.replicas
+    }
+
+    if not is_healthy:
+        overall = "unhealthy"
+    elif checks["redis"] != "healthy":
+        overall = "degraded"
+    else:
+        overall = "healthy"
 
     return {
-        "status": "healthy" if is_healthy else "unhealthy",
+        "status": overall,
         "checks": checks,
+        "replicas": replicas,
+        "redis_circuit": breaker.state,
     }
 
 
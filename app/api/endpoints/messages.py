@@ -1,12 +1,14 @@
 """Message endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
 
-from app.core.database import get_db
+from app.core import statements
+from app.core.database import get_db, get_read_db, release_db
+from app.core.query_stats import query_budget
 from app.core.security import get_current_user_id
 from app.models.transaction import Message
 from app.schemas.transaction import MessageCreate, MessageResponse
+from app.services.outbox import record_event
 
 router = APIRouter()
 
@@ -33,26 +35,29 @@ async def send_message(
     )
 
     db.add(new_message)
+    await db.flush()
+
+    record_event(db, "message", new_message.id, "message.sent", {
+        "id": new_message.id,
+        "sender_id": user_id,
+        "receiver_id": new_message.receiver_id,
+        "product_id": new_message.product_id,
+    })
+
     await db.commit()
     await db.refresh(new_message)
 
     return new_message
 
 
-@router.get("/", response_model=list[MessageResponse])
+@router.get("/", response_model=list[MessageResponse], dependencies=[Depends(query_budget(1))])
 async def list_messages(
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all messages for current user."""
-    query = select(Message).where(
-        or_(
-            Message.sender_id == user_id,
-            Message.receiver_id == user_id,
-        )
-    ).order_by(Message.created_at.desc())
-
-    result = await db.execute(query)
+    result = await db.execute(statements.user_messages(user_id))
     messages = result.scalars().all()
+    await release_db(db)
 
     return messages
@@ -2,57 +2,56 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import update
 
-from app.core.database import get_db
+from app.core import statements
+from app.core.cache import cached
+from app.core.config import settings
+from app.core.database import get_db, get_read_db, primary_session, release_db
+from app.core.query_stats import query_budget
 from app.core.security import get_current_user_id
+from app.core.warmup import reference_data
 from app.models.product import Product, ProductImage, ProductStatus
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductList
+from app.schemas.product import (
+    CategoryResponse, ProductCreate, ProductUpdate, ProductResponse, ProductList,
+)
+from app.services.outbox import record_event
+from app.services.products import invalidate_listings, listing_generation
 
 router = APIRouter()
 
 
-@router.get("/", response_model=ProductList)
-async def list_products(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
-    status: Optional[str] = None,
-    category_id: Optional[int] = None,
-    search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
-):
-    """List products with pagination and filters."""
-    query = select(Product).options(
-        selectinload(Product.images),
-        selectinload(Product.category)
+def _product_list_key(db, generation, page, page_size, status, category_id, search) -> Optional[str]:
+    # Searches are too varied to be worth caching, and users who just wrote
+    # read the primary so they see their own changes, not a cached page
+    if search or db.info.get("read_your_writes"):
+        return None
+    return f"products:list:{generation}:{status or ''}:{category_id or ''}:{page}:{page_size}"
+
+
+@cached(key=_product_list_key, ttl=settings.PRODUCT_LIST_CACHE_TTL)
+async def _load_product_list(
+    db: AsyncSession,
+    generation: str,
+    page: int,
+    page_size: int,
+    status: Optional[str],
+    category_id: Optional[int],
+    search: Optional[str],
+) -> dict:
+    total_result = await db.execute(
+        statements.product_count(status, category_id, search)
     )
-
-    # Apply filters
-    if status:
-        query = query.where(Product.status == status)
-    else:
-        query = query.where(Product.status == ProductStatus.AVAILABLE)
-
-    if category_id:
-        query = query.where(Product.category_id == category_id)
-
-    if search:
-        query = query.where(
-            Product.title.ilike(f"%{search}%") | Product.description.ilike(f"%{search}%")
-        )
-
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
     total = total_result.scalar()
 
-    # Apply pagination
-    query = query.order_by(Product.created_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-
-    result = await db.execute(query)
+    result = await db.execute(
+        statements.product_page(
+            status, category_id, search,
+            offset=(page - 1) * page_size, limit=page_size,
+        )
+    )
     products = result.scalars().all()
+    await release_db(db)
 
     return ProductList(
         items=products,
@@ -60,21 +59,48 @@ async def list_products(
         page=page,
         page_size=page_size,
         pages=(total + page_size - 1) // page_size,
+    ).model_dump(mode="json")
+
+
+@router.get("/", response_model=ProductList, dependencies=[Depends(query_budget(4))])
+async def list_products(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    status: Optional[str] = None,
+    category_id: Optional[int] = None,
+    search: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List products with pagination and filters (cached briefly unless searching)."""
+    return await _load_product_list(
+        db, await listing_generation(), page, page_size, status, category_id, search,
     )
 
 
-@router.get("/{product_id}", response_model=ProductResponse)
+@router.get(
+    "/categories",
+    response_model=list[CategoryResponse],
+    dependencies=[Depends(query_budget(1))],
+)
+async def list_categories(db: AsyncSession = Depends(get_read_db)):
+    """List active categories (served from memory, preloaded at startup)."""
+    if reference_data.stale:
+        await reference_data.load(db)
+    await release_db(db)
+    return reference_data.categories
+
+
+@router.get(
+    "/{product_id}",
+    response_model=ProductResponse,
+    dependencies=[Depends(query_budget(4))],
+)
 async def get_product(
     product_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get product by ID."""
-    query = select(Product).options(
-        selectinload(Product.images),
-        selectinload(Product.category)
-    ).where(Product.id == product_id)
-
-    result = await db.execute(query)
+    result = await db.execute(statements.product_detail(product_id))
     product = result.scalar_one_or_none()
 
     if not product:
@@ -83,9 +109,17 @@ async def get_product(
             detail="Product not found",
         )
 
-    # Increment views
+    # Increment views on the primary. The UPDATE may run in this same
+    # session, so don't let it synchronize the loaded product as well;
+    # the one increment below is what the response shows
+    async with primary_session(db) as primary:
+        await primary.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(views=Product.views + 1)
+            .execution_options(pin_reads=False, synchronize_session=False)
+        )
     product.views += 1
-    await db.commit()
 
     return product
 
@@ -127,7 +161,17 @@ async def create_product(
             )
             db.add(image)
 
+    record_event(db, "product", new_product.id, "product.created", {
+        "id": new_product.id,
+        "seller_id": user_id,
+        "category_id": new_product.category_id,
+        "title": new_product.title,
+        "price": new_product.price,
+        "status": ProductStatus.AVAILABLE,
+    })
+
     await db.commit()
+    await invalidate_listings()
     await db.refresh(new_product)
 
     return new_product
@@ -141,9 +185,7 @@ async def update_product(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a product."""
-    result = await db.execute(
-        select(Product).where(Product.id == product_id)
-    )
+    result = await db.execute(statements.product_by_id(product_id))
     product = result.scalar_one_or_none()
 
     if not product:
@@ -159,10 +201,19 @@ async def update_product(
         )
 
     # Update fields
-    for field, value in product_data.model_dump(exclude_unset=True).items():
+    changes = product_data.model_dump(exclude_unset=True)
+    for field, value in changes.items():
         setattr(product, field, value)
 
+    record_event(db, "product", product.id, "product.updated", {
+        "id": product.id,
+        "seller_id": product.seller_id,
+        "category_id": product.category_id,
+        "changes": changes,
+    })
+
     await db.commit()
+    await invalidate_listings()
     await db.refresh(product)
 
     return product
@@ -175,9 +226,7 @@ async def delete_product(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a product (soft delete)."""
-    result = await db.execute(
-        select(Product).where(Product.id == product_id)
-    )
+    result = await db.execute(statements.product_by_id(product_id))
     product = result.scalar_one_or_none()
 
     if not product:
@@ -193,4 +242,12 @@ async def delete_product(
         )
 
     product.status = ProductStatus.REMOVED
+
+    record_event(db, "product", product.id, "product.removed", {
+        "id": product.id,
+        "seller_id": product.seller_id,
+        "category_id": product.category_id,
+    })
+
     await db.commit()
+    await invalidate_listings()
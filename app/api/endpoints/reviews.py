@@ -0,0 +1,146 @@
+"""Review endpoints."""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, tuple_
+
+from app.core.database import get_db, get_read_db, release_db
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.query_stats import query_budget
+from app.core.security import get_current_user_id
+from app.models.transaction import Review, Transaction, TransactionStatus
+from app.models.user import User
+from app.schemas.transaction import ReviewCreate, ReviewResponse, ReviewList
+from app.schemas.user import UserRatingSummary
+from app.services.ratings import apply_review
+
+router = APIRouter()
+
+
+@router.post("/", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
+async def create_review(
+    review_data: ReviewCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Review the other party of a transaction.
+
+    The reviewed user's rating aggregates are updated incrementally in the
+    same database transaction as the review INSERT.
+    """
+    result = await db.execute(
+        select(Transaction.buyer_id, Transaction.seller_id, Transaction.status)
+        .where(Transaction.id == review_data.transaction_id)
+    )
+    transaction = result.one_or_none()
+
+    if not transaction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found",
+        )
+
+    if user_id not in (transaction.buyer_id, transaction.seller_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to review this transaction",
+        )
+
+    counterparty_id = (
+        transaction.seller_id if user_id == transaction.buyer_id else transaction.buyer_id
+    )
+    if review_data.reviewed_id != counterparty_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Can only review the other party of the transaction",
+        )
+
+    if transaction.status == TransactionStatus.CANCELLED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot review a cancelled transaction",
+        )
+
+    new_review = Review(
+        transaction_id=review_data.transaction_id,
+        reviewer_id=user_id,
+        reviewed_id=review_data.reviewed_id,
+        rating=review_data.rating,
+        comment=review_data.comment,
+        communication_rating=review_data.communication_rating,
+        punctuality_rating=review_data.punctuality_rating,
+        product_accuracy_rating=review_data.product_accuracy_rating,
+    )
+
+    db.add(new_review)
+    try:
+        await db.flush()
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Transaction already reviewed",
+        ) from e
+
+    await apply_review(db, new_review)
+    await db.commit()
+    await db.refresh(new_review)
+
+    return new_review
+
+
+@router.get("/users/{user_id}", response_model=ReviewList, dependencies=[Depends(query_budget(1))])
+async def list_user_reviews(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List visible reviews received by a user, newest first."""
+    query = select(Review).where(
+        Review.reviewed_id == user_id,
+        Review.is_visible.is_(True),
+    )
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(Review.created_at, Review.id) < tuple_(cursor_created_at, cursor_id)
+        )
+
+    query = query.order_by(Review.created_at.desc(), Review.id.desc()).limit(limit + 1)
+
+    result = await db.execute(query)
+    reviews = result.scalars().all()
+    await release_db(db)
+
+    next_cursor = None
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        last = reviews[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return ReviewList(items=reviews, next_cursor=next_cursor)
+
+
+@router.get(
+    "/users/{user_id}/summary",
+    response_model=UserRatingSummary,
+    dependencies=[Depends(query_budget(1))],
+)
+async def get_rating_summary(
+    user_id: int,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get a user's overall and per-aspect ratings from the stored aggregates."""
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    return user
@@ -1,47 +1,87 @@
 """Transaction endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import update
 
-from app.core.database import get_db
+from app.core import statements
+from app.core.database import get_db, get_read_db, release_db
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.query_stats import query_budget
 from app.core.security import get_current_user_id
-from app.models.transaction import Transaction
-from app.models.product import Product
-from app.schemas.transaction import TransactionCreate, TransactionResponse
+from app.models.transaction import Transaction, TransactionStatus
+from app.models.product import Product, ProductStatus
+from app.schemas.transaction import (
+    TransactionCreate, TransactionResponse, TransactionHistory,
+)
+from app.services.outbox import record_event
+from app.services.products import invalidate_listings
 
 router = APIRouter()
 
 
-@router.post("/", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=TransactionResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(4))],
+)
 async def create_transaction(
     transaction_data: TransactionCreate,
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    """Create a new transaction."""
-    # Get product
+    """
+    Create a new transaction.
+
+    The product is reserved with a single conditional UPDATE so that only one
+    buyer can win a hot item; concurrent buyers contend on the product row
+    only and the losers get a 409 instead of a duplicate pending transaction.
+    The reservation commits (or rolls back) together with the transaction.
+    """
+    # Atomically reserve the product
     result = await db.execute(
-        select(Product).where(Product.id == transaction_data.product_id)
+        update(Product)
+        .where(
+            Product.id == transaction_data.product_id,
+            Product.status == ProductStatus.AVAILABLE,
+            Product.seller_id != user_id,
+        )
+        .values(status=ProductStatus.RESERVED)
+        .returning(Product.seller_id)
+        .execution_options(synchronize_session=False)
     )
-    product = result.scalar_one_or_none()
+    seller_id = result.scalar_one_or_none()
 
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Product not found",
+    if seller_id is None:
+        # Reservation failed - work out why without taking any lock
+        result = await db.execute(
+            statements.product_owner_status(transaction_data.product_id)
         )
+        product = result.one_or_none()
+
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found",
+            )
+
+        if product.seller_id == user_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot buy your own product",
+            )
 
-    if product.seller_id == user_id:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot buy your own product",
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Product is not available",
         )
 
     # Create transaction
     new_transaction = Transaction(
         product_id=transaction_data.product_id,
         buyer_id=user_id,
-        seller_id=product.seller_id,
+        seller_id=seller_id,
         amount=transaction_data.amount,
         payment_method=transaction_data.payment_method,
         meeting_location=transaction_data.meeting_location,
@@ -50,22 +90,74 @@ async def create_transaction(
     )
 
     db.add(new_transaction)
+    await db.flush()
+
+    record_event(db, "transaction", new_transaction.id, "transaction.created", {
+        "id": new_transaction.id,
+        "product_id": new_transaction.product_id,
+        "buyer_id": user_id,
+        "seller_id": seller_id,
+        "amount": new_transaction.amount,
+    })
+
     await db.commit()
+    # The reserved product drops out of the available listings
+    await invalidate_listings()
     await db.refresh(new_transaction)
 
     return new_transaction
 
 
-@router.get("/{transaction_id}", response_model=TransactionResponse)
+@router.get("/", response_model=TransactionHistory, dependencies=[Depends(query_budget(1))])
+async def list_transactions(
+    role: Literal["buyer", "seller"] = "buyer",
+    status_filter: Optional[TransactionStatus] = Query(None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    List the current user's purchases or sales, newest first.
+
+    Uses keyset pagination over (buyer_id|seller_id, created_at, id) so every
+    page is an index range scan regardless of how deep the history is. The
+    product summary is joined into the same query.
+    """
+    # Fetch one extra row to know whether another page exists
+    query = statements.transaction_history(
+        user_id,
+        as_seller=role == "seller",
+        status=status_filter,
+        cursor=decode_cursor(cursor) if cursor else None,
+        limit=limit + 1,
+    )
+
+    result = await db.execute(query)
+    transactions = result.scalars().all()
+    await release_db(db)
+
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        last = transactions[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return TransactionHistory(items=transactions, next_cursor=next_cursor)
+
+
+@router.get(
+    "/{transaction_id}",
+    response_model=TransactionResponse,
+    dependencies=[Depends(query_budget(1))],
+)
 async def get_transaction(
     transaction_id: int,
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Get transaction by ID."""
-    result = await db.execute(
-        select(Transaction).where(Transaction.id == transaction_id)
-    )
+    result = await db.execute(statements.transaction_by_id(transaction_id))
     transaction = result.scalar_one_or_none()
 
     if not transaction:
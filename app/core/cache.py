@@ -0,0 +1,484 @@
+"""
+Two-tier cache: an in-process LRU (L1) in front of Redis (L2).
+
+A Redis hit still costs a network round trip plus decoding, which adds up
+for keys read thousands of times per second per pod. L1 keeps decoded
+values in process memory, bounded by the serialized size of the entries
+before compression (CACHE_L1_MAX_BYTES) and by a short TTL (CACHE_L1_TTL) that caps how
+stale a pod can be if it misses an invalidation.
+
+Writes and deletes through the cache publish the affected keys on
+CACHE_INVALIDATION_CHANNEL; every pod drops them from its L1. The
+listener holds one connection from the Redis pool. If it loses its
+subscription, L1 is cleared when it resubscribes, since anything
+published in between was missed.
+
+Values are shared between requests, so treat them as read-only, and
+cache plain JSON-compatible data (e.g. model_dump(mode="json")), not ORM
+objects.
+
+get_or_compute() and the @cached decorator protect hot keys against
+stampedes. Concurrent misses in one process share a single computation
+(single-flight). Across pods, a short Redis lock lets one pod recompute
+while the others wait for its result, or keep serving the stale value.
+Entries record how long they took to compute, so a key can be refreshed
+early with probability rising towards expiry (XFetch; Vattani et al.,
+"Optimal Probabilistic Cache Stampede Prevention"). A busy key is then
+usually recomputed before it expires at all.
+
+Hit ratio per tier:
+    sum by (tier) (rate(cache_requests_total{result="hit"}[5m]))
+      / sum by (tier) (rate(cache_requests_total[5m]))
+"""
+import asyncio
+import functools
+import json
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable, Optional
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import (
+    CACHE_REQUESTS, CACHE_L1_BYTES, CACHE_L1_ENTRIES, CACHE_L1_EVICTIONS,
+    CACHE_INVALIDATIONS, CACHE_RECOMPUTES, CACHE_COALESCED,
+)
+from app.core.codecs import value_codec
+from app.core.redis import decode_value_sized, redis_client
+
+logger = structlog.get_logger()
+
+_l1_hits = CACHE_REQUESTS.labels(tier="l1", result="hit")
+_l1_misses = CACHE_REQUESTS.labels(tier="l1", result="miss")
+_l2_hits = CACHE_REQUESTS.labels(tier="l2", result="hit")
+_l2_misses = CACHE_REQUESTS.labels(tier="l2", result="miss")
+
+# Delete the lock only if we still own it
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class LocalCache:
+    """Bounded, TTL-aware LRU of decoded values, sized by serialized bytes."""
+
+    def __init__(self, max_bytes: int = settings.CACHE_L1_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        # key -> (value, size, expires_at)
+        self._entries: OrderedDict[str, tuple[Any, int, float]] = OrderedDict()
+        CACHE_L1_BYTES.set_function(lambda: self.size)
+        CACHE_L1_ENTRIES.set_function(lambda: len(self._entries))
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Value, or None on a miss or if the entry has expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry[2] <= time.monotonic():
+            self._remove(key)
+            CACHE_L1_EVICTIONS.labels(reason="expired").inc()
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, value: Any, size: int, ttl: float) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Decoded value
+            size: Serialized size in bytes before compression, used for
+                the memory bound
+            ttl: Seconds until the entry expires
+        """
+        self._remove(key)
+        # An entry larger than a quarter of L1 would evict most of it
+        if ttl <= 0 or size > self.max_bytes // 4:
+            return
+
+        self._entries[key] = (value, size, time.monotonic() + ttl)
+        self.size += size
+
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            CACHE_L1_EVICTIONS.labels(reason="capacity").inc()
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size -= entry[1]
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Drop a key; returns whether it was cached."""
+        return self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TwoTierCache:
+    """L1 in process memory, L2 in Redis, with cross-pod invalidation."""
+
+    def __init__(self, local: Optional[LocalCache] = None):
+        self.local = local if local is not None else LocalCache()
+        # Identifies this process's own invalidation messages
+        self.instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        # key -> result of the computation in flight for it
+        self._flights: dict[str, asyncio.Future] = {}
+        self._release_script = None
+
+    @staticmethod
+    def _local_ttl(ttl: Optional[float]) -> float:
+        return settings.CACHE_L1_TTL if ttl is None else min(ttl, settings.CACHE_L1_TTL)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value from L1, falling back to Redis.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if neither tier has it
+        """
+        value = self.local.get(key)
+        if value is not None:
+            _l1_hits.inc()
+            return value
+        _l1_misses.inc()
+
+        value, size = decode_value_sized(await redis_client.get_raw(key))
+        if value is None:
+            _l2_misses.inc()
+            return None
+        _l2_hits.inc()
+
+        self.local.put(key, value, size, self._local_ttl(None))
+        return value
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """
+        Get several values; keys missing from L1 are fetched in one MGET.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Key to value for the keys found in either tier
+        """
+        found: dict[str, Any] = {}
+        remote: list[str] = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is not None:
+                _l1_hits.inc()
+                found[key] = value
+            else:
+                _l1_misses.inc()
+                remote.append(key)
+
+        if remote:
+            local_ttl = self._local_ttl(None)
+            for key, data in zip(remote, await redis_client.mget_raw(remote)):
+                value, size = decode_value_sized(data)
+                if value is None:
+                    _l2_misses.inc()
+                    continue
+                _l2_hits.inc()
+                found[key] = value
+                self.local.put(key, value, size, local_ttl)
+
+        return found
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int,
+        local_ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Store a value in both tiers and invalidate it on other pods.
+
+        Args:
+            key: Cache key
+            value: Value supported by CACHE_CODEC (None is not cacheable)
+            ttl: Redis expiration in seconds
+            local_ttl: L1 expiration in seconds, capped at CACHE_L1_TTL
+        """
+        data, size = value_codec.encode_sized(value)
+        self.local.put(
+            key, value, size,
+            self._local_ttl(ttl if local_ttl is None else min(ttl, local_ttl)),
+        )
+        await redis_client.set_raw(key, data, expire=ttl)
+        await self._publish([key])
+
+    async def delete(self, *keys: str) -> None:
+        """
+        Remove keys from both tiers on every pod.
+
+        Args:
+            keys: Cache keys
+        """
+        if not keys:
+            return
+        for key in keys:
+            self.local.delete(key)
+        await redis_client.delete(*keys)
+        await self._publish(list(keys))
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        beta: float = settings.CACHE_EARLY_REFRESH_BETA,
+    ) -> Any:
+        """
+        Get a value, computing and caching it on a miss without stampeding.
+
+        Args:
+            key: Cache key
+            compute: Coroutine function producing a JSON-compatible value
+            ttl: Lifetime of the computed value in seconds
+            beta: Early refresh aggressiveness; 0 disables early refresh
+
+        Returns:
+            Cached or freshly computed value
+        """
+        entry = await self.get(key)
+        if entry is not None and not self._refresh_early(entry, beta):
+            return entry["value"]
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            CACHE_COALESCED.labels(scope="process").inc()
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+                # The request computing it went away; do it ourselves
+                return await compute()
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        try:
+            value = await self._recompute(key, compute, ttl, stale=entry)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            # Followers re-raise it; don't warn if there are none
+            flight.exception()
+            raise
+        else:
+            flight.set_result(value)
+            return value
+        finally:
+            self._flights.pop(key, None)
+
+    @staticmethod
+    def _refresh_early(entry: dict, beta: float) -> bool:
+        # XFetch: recompute when now - delta * beta * ln(rand) passes expiry
+        if beta <= 0:
+            return False
+        jitter = -entry["delta"] * beta * math.log(random.random() or 1e-12)
+        return time.time() + jitter >= entry["expires_at"]
+
+    async def _recompute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale: Optional[dict],
+    ) -> Any:
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        locked = await self._acquire_lock(lock_key, token)
+
+        if not locked:
+            # Another pod is computing it: serve stale, or wait for its result
+            if stale is not None:
+                CACHE_COALESCED.labels(scope="cluster").inc()
+                return stale["value"]
+            entry = await self._wait_for(key)
+            if entry is not None:
+                CACHE_COALESCED.labels(scope="cluster").inc()
+                return entry["value"]
+
+        CACHE_RECOMPUTES.labels(reason="miss" if stale is None else "early").inc()
+        try:
+            started_at = time.perf_counter()
+            value = await compute()
+            delta = time.perf_counter() - started_at
+            await self.set(
+                key,
+                {"value": value, "delta": delta, "expires_at": time.time() + ttl},
+                ttl,
+            )
+            return value
+        finally:
+            if locked:
+                await self._release_lock(lock_key, token)
+
+    async def _acquire_lock(self, lock_key: str, token: str) -> bool:
+        if not redis_client.redis:
+            return True
+        try:
+            return bool(await redis_client.redis.set(
+                lock_key, token, nx=True, px=int(settings.CACHE_LOCK_TIMEOUT * 1000),
+            ))
+        except Exception as e:
+            # Fail open: computing twice beats not computing at all
+            logger.warning("cache_lock_failed", key=lock_key, error=str(e))
+            return True
+
+    async def _release_lock(self, lock_key: str, token: str) -> None:
+        if not redis_client.redis:
+            return
+        try:
+            if self._release_script is None:
+                self._release_script = redis_client.redis.register_script(RELEASE_LOCK_LUA)
+            await self._release_script(keys=[lock_key], args=[token])
+        except Exception as e:
+            # The lock expires on its own
+            logger.warning("cache_unlock_failed", key=lock_key, error=str(e))
+
+    async def _wait_for(self, key: str) -> Optional[dict]:
+        """Poll Redis for a value another pod is computing, up to the lock timeout."""
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        delay = 0.01
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+            entry, size = decode_value_sized(await redis_client.get_raw(key))
+            if entry is not None:
+                self.local.put(key, entry, size, self._local_ttl(None))
+                return entry
+        return None
+
+    async def _publish(self, keys: list[str]) -> None:
+        if not redis_client.available:
+            return
+        message = json.dumps({"origin": self.instance_id, "keys": keys})
+        try:
+            await redis_client.redis.publish(settings.CACHE_INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            # Other pods catch up when their L1 entries expire
+            logger.warning("cache_invalidation_publish_failed", error=str(e))
+
+    def _on_message(self, data: str) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.instance_id:
+            return
+        for key in message.get("keys", []):
+            if self.local.delete(key):
+                CACHE_INVALIDATIONS.inc()
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = redis_client.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                # Invalidations sent while unsubscribed were missed
+                self.local.clear()
+                while True:
+                    # Poll with an explicit timeout; a blocking read would
+                    # trip the socket timeout whenever the channel is quiet
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("cache_invalidation_listener_failed", error=str(e))
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self) -> None:
+        """Start listening for invalidations from other pods."""
+        if self._listener is not None or not redis_client.redis:
+            return
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the invalidation listener."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+# Global two-tier cache
+cache = TwoTierCache()
+
+
+def cached(
+    key: Callable[..., Optional[str]],
+    ttl: int,
+    beta: float = settings.CACHE_EARLY_REFRESH_BETA,
+):
+    """
+    Cache an async function's result with stampede protection.
+
+    Usage:
+        @cached(key=lambda db, page: f"products:list:{page}", ttl=30)
+        async def load_page(db, page) -> dict: ...
+
+    Args:
+        key: Builds the cache key from the call's arguments; returning
+            None bypasses the cache for that call
+        ttl: Lifetime of a computed value in seconds
+        beta: Early refresh aggressiveness; 0 disables early refresh
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            if cache_key is None:
+                return await func(*args, **kwargs)
+            return await cache.get_or_compute(
+                cache_key, lambda: func(*args, **kwargs), ttl, beta,
+            )
+        return wrapper
+    return decorator
@@ -0,0 +1,220 @@
+"""
+Serialization of values stored in Redis.
+
+Every value is written with a 3-byte header: format version, codec id and
+compression id. Readers understand every codec and compression listed
+here whatever the writer is configured with, so CACHE_CODEC and
+CACHE_COMPRESSION can be changed on a running fleet; old entries decode
+until they expire. Values without a header were written before the
+header existed (JSON text or a raw string) and are still read.
+
+Codecs:
+    json     stdlib, always available
+    orjson   much faster JSON
+    msgpack  compact binary; tuples come back as lists
+
+Compression, applied only to payloads of CACHE_COMPRESSION_MIN_BYTES or
+more (small values get bigger, not smaller):
+    none, zlib (stdlib), zstd, lz4
+
+Third-party libraries are imported when a codec is first used, so a
+missing one only matters if it is configured or found in stored data.
+"""
+import json
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+FORMAT_VERSION = 1
+HEADER_SIZE = 3
+
+
+class CodecError(ValueError):
+    """A stored value could not be decoded."""
+
+
+@dataclass(frozen=True)
+class Codec:
+    """A serialization or compression format and its wire id."""
+    id: int
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _json() -> Codec:
+    return Codec(
+        1, "json",
+        lambda value: json.dumps(value, separators=(",", ":")).encode(),
+        json.loads,
+    )
+
+
+def _orjson() -> Codec:
+    import orjson
+    return Codec(2, "orjson", orjson.dumps, orjson.loads)
+
+
+def _msgpack() -> Codec:
+    import msgpack
+    return Codec(
+        3, "msgpack",
+        lambda value: msgpack.packb(value, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False),
+    )
+
+
+def _none() -> Codec:
+    return Codec(0, "none", lambda data: data, lambda data: data)
+
+
+def _zlib() -> Codec:
+    return Codec(1, "zlib", lambda data: zlib.compress(data, 6), zlib.decompress)
+
+
+def _zstd() -> Codec:
+    import zstandard
+    compressor = zstandard.ZstdCompressor(level=3)
+    decompressor = zstandard.ZstdDecompressor()
+    return Codec(2, "zstd", compressor.compress, decompressor.decompress)
+
+
+def _lz4() -> Codec:
+    import lz4.frame
+    return Codec(3, "lz4", lz4.frame.compress, lz4.frame.decompress)
+
+
+SERIALIZERS: dict[str, Callable[[], Codec]] = {
+    "json": _json, "orjson": _orjson, "msgpack": _msgpack,
+}
+COMPRESSORS: dict[str, Callable[[], Codec]] = {
+    "none": _none, "zlib": _zlib, "zstd": _zstd, "lz4": _lz4,
+}
+_SERIALIZER_IDS = {1: "json", 2: "orjson", 3: "msgpack"}
+_COMPRESSOR_IDS = {0: "none", 1: "zlib", 2: "zstd", 3: "lz4"}
+
+
+@lru_cache(maxsize=None)
+def serializer(name: str) -> Codec:
+    """Serializer by name; raises ImportError if its library is missing."""
+    return SERIALIZERS[name]()
+
+
+@lru_cache(maxsize=None)
+def compressor(name: str) -> Codec:
+    """Compressor by name; raises ImportError if its library is missing."""
+    return COMPRESSORS[name]()
+
+
+class ValueCodec:
+    """Encodes values with the configured formats and decodes any known format."""
+
+    def __init__(
+        self,
+        codec: str = settings.CACHE_CODEC,
+        compression: str = settings.CACHE_COMPRESSION,
+        min_compress_bytes: int = settings.CACHE_COMPRESSION_MIN_BYTES,
+    ):
+        if codec not in SERIALIZERS:
+            raise ValueError(f"unknown cache codec {codec!r}")
+        if compression not in COMPRESSORS:
+            raise ValueError(f"unknown cache compression {compression!r}")
+        self.codec = codec
+        self.compression = compression
+        self.min_compress_bytes = min_compress_bytes
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Serialize a value with a header.
+
+        Args:
+            value: Value supported by the configured codec
+
+        Returns:
+            Header followed by the (possibly compressed) payload
+        """
+        return self.encode_sized(value)[0]
+
+    def encode_sized(self, value: Any) -> tuple[bytes, int]:
+        """
+        Serialize a value with a header, also reporting its serialized size.
+
+        The serialized size (before compression) tracks how much memory the
+        decoded value takes far better than the stored size, which a
+        compressible value can make many times smaller.
+
+        Args:
+            value: Value supported by the configured codec
+
+        Returns:
+            Stored bytes, and the payload size before compression
+        """
+        writer = serializer(self.codec)
+        payload = writer.dumps(value)
+        size = len(payload)
+        packer = compressor("none")
+        if self.compression != "none" and size >= self.min_compress_bytes:
+            packer = compressor(self.compression)
+            payload = packer.dumps(payload)
+        return bytes((FORMAT_VERSION, writer.id, packer.id)) + payload, size
+
+    def decode(self, data: Optional[bytes]) -> Optional[Any]:
+        """
+        Deserialize a stored value in any known format.
+
+        Args:
+            data: Raw value from Redis
+
+        Returns:
+            Value, or None for a missing key
+
+        Raises:
+            CodecError: If the value is corrupt or uses an unknown format
+        """
+        return self.decode_sized(data)[0]
+
+    def decode_sized(self, data: Optional[bytes]) -> tuple[Optional[Any], int]:
+        """
+        Deserialize a stored value, also reporting its serialized size.
+
+        Args:
+            data: Raw value from Redis
+
+        Returns:
+            Value (None for a missing key), and the payload size after
+            decompression (0 for a missing key)
+
+        Raises:
+            CodecError: If the value is corrupt or uses an unknown format
+        """
+        if not data:
+            return None, 0
+
+        if data[0] != FORMAT_VERSION:
+            # Written before values had a header: JSON text or a raw string
+            text = data.decode("utf-8", errors="replace")
+            try:
+                return json.loads(text), len(data)
+            except json.JSONDecodeError:
+                return text, len(data)
+
+        if len(data) < HEADER_SIZE:
+            raise CodecError("truncated header")
+        try:
+            reader = serializer(_SERIALIZER_IDS[data[1]])
+            unpacker = compressor(_COMPRESSOR_IDS[data[2]])
+            payload = unpacker.loads(data[HEADER_SIZE:])
+            return reader.loads(payload), len(payload)
+        except KeyError:
+            raise CodecError(f"unknown format {data[1]}/{data[2]}") from None
+        except ImportError as e:
+            raise CodecError(f"codec library missing: {e}") from None
+        except Exception as e:
+            raise CodecError(str(e)) from e
+
+
+# Codec configured for this process
+value_codec = ValueCodec()
@@ -33,6 +33,20 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Verified access tokens cached in-process (0 disables)
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+
+    # Login throttling (sliding window failures, exponential lockout)
+    LOGIN_FAILURE_WINDOW_SECONDS: int = 900
+    LOGIN_MAX_FAILURES_PER_EMAIL: int = 5
+    LOGIN_MAX_FAILURES_PER_IP: int = 20
+    LOGIN_LOCKOUT_BASE_SECONDS: int = 30
+    LOGIN_LOCKOUT_MAX_SECONDS: int = 3600
+
+    # Password hashing pool (bcrypt runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # queued + running before shedding load
+
     # Database
     POSTGRES_SERVER: str = "postgres"
     POSTGRES_PORT: int = 5432
@@ -41,6 +55,40 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "multiweb"
     DATABASE_URL: Optional[PostgresDsn] = None
 
+    # Connection pool (per process). Size against Postgres max_connections:
+    # replicas * workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) must fit.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+
+    # Statement caching
+    DB_QUERY_CACHE_SIZE: int = 1200  # compiled SQL cache entries per engine
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # per connection; 0 behind pgbouncer transaction pooling
+
+    # Startup schema check against the migrations in this build
+    DB_SCHEMA_CHECK: str = "strict"  # strict | warn | off
+
+    # Startup warmup before /health/ready reports healthy
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5  # per engine; keep <= DB_POOL_SIZE
+    WARMUP_REDIS_CONNECTIONS: int = 5  # per Redis pool (text and binary)
+    WARMUP_TIMEOUT: float = 30.0  # seconds; the pod becomes ready regardless after this
+    REFERENCE_DATA_TTL: float = 300.0  # seconds before categories are reloaded
+
+    # Query instrumentation
+    SLOW_QUERY_MS: float = 200.0  # log statements slower than this
+    QUERY_BUDGET_ENFORCE: bool = False  # raise on budget overruns (enable in test runs)
+    QUERY_FINGERPRINT_LABELS: int = 200  # distinct fingerprints exported as labels; the rest are "other"
+
+    # Read replicas (JSON list of asyncpg URLs; empty = all reads on primary)
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_SELECTION: str = "least_latency"  # or "round_robin"
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_CHECK_INTERVAL: float = 5.0
+    READ_YOUR_WRITES_SECONDS: float = 10.0  # pin a user's reads to primary after a write
+
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
     def assemble_db_connection(cls, v: Optional[str], info) -> str:
@@ -72,6 +120,29 @@ class Settings(BaseSettings):
             return f"redis://:{password}@{values.get('REDIS_HOST')}:{values.get('REDIS_PORT')}/{values.get('REDIS_DB')}"
         return f"redis://{values.get('REDIS_HOST')}:{values.get('REDIS_PORT')}/{values.get('REDIS_DB')}"
 
+    # Redis connection pools (the API keeps two: text and binary values)
+    REDIS_MAX_CONNECTIONS: int = 20  # per pool
+    REDIS_POOL_TIMEOUT: float = 1.0  # seconds to wait for a free connection
+
+    # Redis failure handling
+    REDIS_SOCKET_TIMEOUT: float = 0.5  # seconds per command read/write
+    REDIS_CONNECT_TIMEOUT: float = 0.5
+    REDIS_BREAKER_FAILURES: int = 5  # consecutive errors before failing fast
+    REDIS_BREAKER_RESET_SECONDS: float = 5.0  # open time before a probe is let through
+
+    # Encoding of cached values (readers accept every format)
+    CACHE_CODEC: str = "orjson"  # json | orjson | msgpack
+    CACHE_COMPRESSION: str = "zstd"  # none | zlib | zstd | lz4
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024  # smaller payloads are stored uncompressed
+
+    # Two-tier cache (in-process L1 in front of Redis)
+    CACHE_L1_MAX_BYTES: int = 32 * 1024 * 1024  # serialized size of L1 values per process, before compression
+    CACHE_L1_TTL: float = 10.0  # seconds; bounds staleness after a missed invalidation
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    CACHE_LOCK_TIMEOUT: float = 5.0  # seconds a recompute lock is held / waited on
+    CACHE_EARLY_REFRESH_BETA: float = 1.0  # >1 refreshes earlier, 0 disables
+    PRODUCT_LIST_CACHE_TTL: int = 30  # seconds; listings tolerate this much staleness
+
     # CORS
     CORS_ORIGINS: list[str] = [
         "http://localhost:3000",
@@ -80,8 +151,14 @@ class Settings(BaseSettings):
     ]
 
     # Rate Limiting
+    RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_BURST: int = 100
+    # Use X-Real-IP set by nginx/ingress, only when the peer is a trusted proxy
+    RATE_LIMIT_TRUST_PROXY: bool = False
+    RATE_LIMIT_TRUSTED_PROXIES: list[str] = []  # proxy addresses or CIDR networks
+    RATE_LIMIT_LEASE_SIZE: int = 5  # tokens spent locally per Redis round trip
+    RATE_LIMIT_LEASE_TTL: float = 1.0  # seconds before an unused lease lapses
 
     # File Upload
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
@@ -92,6 +169,14 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # Outbox relay
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_INTERVAL: float = 0.5  # seconds, when the outbox is empty
+    OUTBOX_STREAM_PREFIX: str = "events"
+    OUTBOX_STREAM_MAXLEN: int = 100_000
+    OUTBOX_RETENTION_HOURS: int = 24
+    OUTBOX_METRICS_PORT: int = 9101
+
     # OpenTelemetry
     OTEL_ENABLED: bool = True
     OTEL_SERVICE_NAME: str = "multiweb-api"
@@ -1,21 +1,123 @@
 """
 Database connection and session management.
+
+Writes go to the primary through get_db(). Read-only endpoints use
+get_read_db(), which hands out a session on a healthy read replica when
+DATABASE_REPLICA_URLS is configured. A user who has just written is pinned
+to the primary for READ_YOUR_WRITES_SECONDS so they always see their own
+changes despite replication lag.
 """
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncGenerator, Optional
+import structlog
+from fastapi import Request
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker,
+)
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.core.config import settings
+from app.core.metrics import (
+    DB_POOL_SIZE, DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW,
+    DB_POOL_CHECKOUT_WAIT, DB_POOL_TIMEOUTS,
+    DB_REPLICA_LAG, DB_REPLICA_HEALTHY, DB_READ_ROUTED,
+)
+from app.core.redis import redis_client
+from app.core.token_cache import request_user_id
+
+logger = structlog.get_logger()
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+MIGRATIONS_DIR = ALEMBIC_INI.parent / "migrations" / "versions"
+
+
+def instrumented_pool_class(name: str) -> type[AsyncAdaptedQueuePool]:
+    """
+    Build a queue pool class that records checkout wait time and timeouts.
+
+    The name is baked into the class (rather than the instance) because
+    engine.dispose() recreates the pool from its class.
+
+    Args:
+        name: Pool label for metrics, e.g. "primary"
+
+    Returns:
+        AsyncAdaptedQueuePool subclass
+    """
+    wait_histogram = DB_POOL_CHECKOUT_WAIT.labels(pool=name)
+    timeouts = DB_POOL_TIMEOUTS.labels(pool=name)
+
+    class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            started_at = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                timeouts.inc()
+                raise
+            finally:
+                wait_histogram.observe(time.perf_counter() - started_at)
+
+    InstrumentedQueuePool.__name__ = f"InstrumentedQueuePool[{name}]"
+    return InstrumentedQueuePool
+
+
+def create_pooled_engine(url: str, name: str) -> AsyncEngine:
+    """
+    Create an async engine sized by the DB_POOL_* and statement cache settings.
+
+    Args:
+        url: Database URL
+        name: Pool label for metrics
+
+    Returns:
+        Async engine
+    """
+    options: dict[str, Any] = {
+        "echo": settings.DEBUG,
+        "future": True,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+        "connect_args": {
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        },
+    }
+
+    if settings.ENVIRONMENT == "test":
+        options["poolclass"] = NullPool
+        return create_async_engine(url, **options)
+
+    new_engine = create_async_engine(
+        url,
+        poolclass=instrumented_pool_class(name),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        **options,
+    )
+
+    # Sampled at scrape time from whatever pool the engine currently holds
+    sync_engine = new_engine.sync_engine
+    DB_POOL_SIZE.labels(pool=name).set_function(lambda: sync_engine.pool.size())
+    DB_POOL_CHECKED_OUT.labels(pool=name).set_function(
+        lambda: sync_engine.pool.checkedout()
+    )
+    DB_POOL_OVERFLOW.labels(pool=name).set_function(
+        lambda: max(0, sync_engine.pool.overflow())
+    )
+
+    return new_engine
+
 
 # Create async engine
-engine = create_async_engine(
-    str(settings.DATABASE_URL),
-    echo=settings.DEBUG,
-    future=True,
-    pool_pre_ping=True,
-    poolclass=NullPool if settings.ENVIRONMENT == "test" else None,
-)
+engine = create_pooled_engine(str(settings.DATABASE_URL), "primary")
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -29,10 +131,240 @@ AsyncSessionLocal = async_sessionmaker(
 # Base class for models
 Base = declarative_base()
 
+# Zero on a replica that has replayed everything it received (an idle
+# primary produces no new transactions, so replay timestamps go stale)
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+# session.info keys:
+#   has_writes      - the session wrote at some point (read-your-writes)
+#   pending_writes  - the current transaction wrote and needs a COMMIT
+#   replica         - name of the replica serving a get_read_db() session
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context: Any) -> None:
+    session.info["has_writes"] = session.info["pending_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_write(orm_execute_state: Any) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    info = orm_execute_state.session.info
+    info["pending_writes"] = True
+    # Statements run with execution_options(pin_reads=False) (e.g. view
+    # counters) are not the user's own data and do not pin them
+    if orm_execute_state.execution_options.get("pin_reads", True):
+        info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_pending_writes(session: Session, transaction: Any) -> None:
+    if transaction.parent is None:
+        session.info.pop("pending_writes", None)
+
+
+def _needs_commit(session: AsyncSession) -> bool:
+    return bool(
+        session.new or session.dirty or session.deleted
+        or session.info.get("pending_writes")
+    )
+
+
+async def release_db(session: AsyncSession) -> None:
+    """
+    Finish a request session's database work early.
+
+    Commits if the session has unsaved or uncommitted writes; otherwise
+    just ends the transaction, returning the connection to the pool without
+    a COMMIT. Handlers call this once their queries are done so the
+    connection is not held while the response is built and serialized.
+    Loaded objects stay usable (detached); using the session again checks
+    out a new connection.
+
+    Args:
+        session: Session from get_db() or get_read_db()
+    """
+    if _needs_commit(session):
+        await session.commit()
+    elif session.in_transaction():
+        # close() rather than rollback(): rollback would expire loaded objects
+        await session.close()
+
+
+class Replica:
+    """A read replica engine and its last observed health."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = create_pooled_engine(url, name)
+        self.sessionmaker = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
+        self.lag: Optional[float] = None  # None until the first successful check
+        self.latency = 0.0  # EWMA of the health check round trip, seconds
+
+    @property
+    def healthy(self) -> bool:
+        return self.lag is not None and self.lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+
+class ReplicaSet:
+    """Chooses a replica for reads and tracks replica lag in the background."""
+
+    def __init__(self, urls: list[str]):
+        self.replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls)]
+        self._round_robin = itertools.count()
+        self._monitor: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        """
+        Pick a healthy replica according to REPLICA_SELECTION.
+
+        Returns:
+            Replica, or None if no replica is fit to serve reads
+        """
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if settings.REPLICA_SELECTION == "round_robin":
+            return healthy[next(self._round_robin) % len(healthy)]
+        return min(healthy, key=lambda replica: replica.latency)
+
+    async def check(self, replica: Replica) -> None:
+        """
+        Measure a replica's replication lag and round-trip latency.
+
+        Args:
+            replica: Replica to probe
+        """
+        started_at = time.perf_counter()
+        try:
+            async with replica.engine.connect() as conn:
+                lag = float((await conn.execute(REPLICA_LAG_SQL)).scalar() or 0)
+        except Exception as e:
+            replica.lag = None
+            logger.warning("replica_check_failed", replica=replica.name, error=str(e))
+        else:
+            elapsed = time.perf_counter() - started_at
+            replica.latency = elapsed if replica.latency == 0 else 0.8 * replica.latency + 0.2 * elapsed
+            replica.lag = lag
+            DB_REPLICA_LAG.labels(replica=replica.name).set(lag)
+        DB_REPLICA_HEALTHY.labels(replica=replica.name).set(1 if replica.healthy else 0)
+
+    async def _monitor_loop(self) -> None:
+        while True:
+            await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+            await asyncio.sleep(settings.REPLICA_CHECK_INTERVAL)
+
+    async def start(self) -> None:
+        """Run a first health check and start the background monitor."""
+        if not self.replicas or self._monitor is not None:
+            return
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+        self._monitor = asyncio.create_task(self._monitor_loop())
+
+    async def stop(self) -> None:
+        """Stop the monitor and close replica connections."""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+            self._monitor = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+# Read replicas (empty set when none are configured)
+replica_set = ReplicaSet(settings.DATABASE_REPLICA_URLS)
+
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+class ReadYourWrites:
     """
-    Dependency for getting async database sessions.
+    Remembers which users wrote recently so their reads stay on the primary.
+
+    Kept in Redis so the pin holds across API replicas, with a local copy
+    so the common case costs no round trip.
+    """
+
+    def __init__(self, max_local_users: int = 10_000):
+        self.max_local_users = max_local_users
+        # user_id -> monotonic deadline
+        self._local: dict[int, float] = {}
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"ryw:{user_id}"
+
+    async def mark(self, user_id: int) -> None:
+        """
+        Pin a user's reads to the primary after a committed write.
+
+        Args:
+            user_id: User who wrote
+        """
+        window = settings.READ_YOUR_WRITES_SECONDS
+        now = time.monotonic()
+        self._local[user_id] = now + window
+        if len(self._local) > self.max_local_users:
+            self._local = {uid: until for uid, until in self._local.items() if until > now}
+
+        if redis_client.redis:
+            try:
+                await redis_client.redis.set(self._key(user_id), 1, px=int(window * 1000))
+            except Exception as e:
+                logger.warning("read_your_writes_mark_failed", error=str(e))
+
+    async def is_pinned(self, user_id: int) -> bool:
+        """
+        Check whether a user wrote within the read-your-writes window.
+
+        Args:
+            user_id: User about to read
+
+        Returns:
+            True if the user's reads must go to the primary
+        """
+        until = self._local.get(user_id)
+        if until is not None and until > time.monotonic():
+            return True
+
+        if not redis_client.redis:
+            return False
+        try:
+            return bool(await redis_client.redis.exists(self._key(user_id)))
+        except Exception as e:
+            # Err towards the primary rather than risk a stale read
+            logger.warning("read_your_writes_check_failed", error=str(e))
+            return True
+
+
+# Global read-your-writes tracker
+read_your_writes = ReadYourWrites()
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for getting async database sessions on the primary.
+
+    A connection is only checked out on the session's first query, and
+    COMMIT is only sent if the request wrote something; pure reads end with
+    the pool's connection reset instead. See release_db() to hand the
+    connection back before the response is serialized.
+
+    Args:
+        request: Current request, used to pin the user to the primary
+            after a committed write
 
     Yields:
         AsyncSession: Database session
@@ -40,20 +372,159 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            if _needs_commit(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
 
+        if session.info.get("has_writes") and replica_set.replicas:
+            user_id = request_user_id(request.scope)
+            if user_id is not None:
+                await read_your_writes.mark(user_id)
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only sessions, served by a replica when possible.
+
+    Falls back to the primary when no replica is configured or healthy, or
+    when the user wrote within READ_YOUR_WRITES_SECONDS. Sessions are
+    closed (and so rolled back) at the end, never committed; use
+    primary_session() for the odd write.
+
+    Args:
+        request: Current request
+
+    Yields:
+        AsyncSession: Database session
+    """
+    sessionmaker = AsyncSessionLocal
+    if not replica_set.replicas:
+        target, reason = "primary", "no_replicas"
+    else:
+        user_id = request_user_id(request.scope)
+        replica = None
+        if user_id is not None and await read_your_writes.is_pinned(user_id):
+            reason = "read_your_writes"
+        else:
+            replica = replica_set.choose()
+            reason = "selected" if replica else "replicas_unhealthy"
+        if replica is not None:
+            target, sessionmaker = replica.name, replica.sessionmaker
+        else:
+            target = "primary"
+    DB_READ_ROUTED.labels(target=target, reason=reason).inc()
+
+    async with sessionmaker() as session:
+        if sessionmaker is not AsyncSessionLocal:
+            session.info["replica"] = target
+        elif reason == "read_your_writes":
+            # Lets callers skip shared caches that may predate the write
+            session.info["read_your_writes"] = True
+        yield session
+
+
+@asynccontextmanager
+async def primary_session(read_session: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session on the primary for a small write in a read-only request.
+
+    Reuses the get_read_db() session when it already runs on the primary
+    (no replicas configured, or the user is pinned), so the request never
+    holds two primary connections; otherwise releases the replica session
+    and opens a short-lived primary one. Writes are committed on exit.
+
+    Args:
+        read_session: Session from get_read_db()
+
+    Yields:
+        AsyncSession: Session on the primary
+    """
+    if read_session.info.get("replica") is None:
+        yield read_session
+        await release_db(read_session)
+        return
+
+    await release_db(read_session)
+    async with AsyncSessionLocal() as session:
+        yield session
+        await release_db(session)
+
+
+def expected_schema_revision() -> str:
+    """
+    Latest migration revision shipped with this build.
+
+    Revision ids are the zero-padded migration file names (0001_baseline,
+    0002_...), so the head is the greatest file name. This avoids loading
+    Alembic on every pod start.
+    """
+    return max(path.stem for path in MIGRATIONS_DIR.glob("[0-9]*.py"))
+
+
+async def check_schema_version() -> None:
+    """
+    Verify the database schema is at the revision this build expects.
+
+    A schema behind this build is an error (or a warning with
+    DB_SCHEMA_CHECK=warn); a newer one is expected mid-rollout, when
+    migrations have been applied ahead of the new code.
+
+    Raises:
+        RuntimeError: If the schema is unmanaged or older than this build
+    """
+    if settings.DB_SCHEMA_CHECK == "off":
+        return
+
+    expected = expected_schema_revision()
+    try:
+        async with engine.connect() as conn:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+    except exc.ProgrammingError:
+        current = None
+
+    if current == expected:
+        logger.info("schema_version_ok", revision=current)
+        return
+
+    if current is not None and current > expected:
+        logger.warning("schema_version_ahead", current=current, expected=expected)
+        return
+
+    message = (
+        f"database schema is at {current or 'no revision'}, expected {expected}; "
+        "run `alembic -c app/alembic.ini upgrade head`"
+    )
+    if settings.DB_SCHEMA_CHECK == "warn":
+        logger.warning("schema_version_behind", current=current, expected=expected)
+        return
+    raise RuntimeError(message)
+
+
+async def run_migrations(revision: str = "head") -> None:
+    """
+    Apply Alembic migrations over the application engine.
+
+    Args:
+        revision: Target revision
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    def upgrade(connection) -> None:
+        config = Config(str(ALEMBIC_INI))
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
 
-async def init_db() -> None:
-    """Initialize database - create all tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    async with engine.connect() as conn:
+        await conn.run_sync(upgrade)
+        await conn.commit()
 
 
 async def close_db() -> None:
     """Close database connections."""
+    await replica_set.stop()
     await engine.dispose()
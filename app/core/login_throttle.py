@@ -0,0 +1,153 @@
+"""
+Login throttling and account lockout.
+
+Failed logins are recorded per email and per client IP in Redis sliding
+windows (sorted sets of failure timestamps). Once a window holds too many
+failures, a lock key is set whose TTL doubles with every further failure.
+The lock is checked before the database lookup and bcrypt verify, so a
+brute-force run is rejected for the cost of one Redis round trip.
+"""
+import hashlib
+import math
+import uuid
+from typing import Optional
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import LOGIN_FAILURES, LOGIN_THROTTLE_REJECTED
+from app.core.redis import redis_client
+
+logger = structlog.get_logger()
+
+# KEYS[1] email failures, KEYS[2] email lock, KEYS[3] ip failures, KEYS[4] ip lock
+# ARGV[1] window (ms), ARGV[2] email threshold, ARGV[3] ip threshold,
+# ARGV[4] base lockout (ms), ARGV[5] max lockout (ms), ARGV[6] unique member
+# Returns {email failures, ip failures}
+RECORD_FAILURE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local window = tonumber(ARGV[1])
+local base = tonumber(ARGV[4])
+local max_lock = tonumber(ARGV[5])
+
+local function record(failures_key, lock_key, threshold)
+    redis.call('ZADD', failures_key, now, ARGV[6])
+    redis.call('ZREMRANGEBYSCORE', failures_key, '-inf', now - window)
+    redis.call('PEXPIRE', failures_key, window)
+    local count = redis.call('ZCARD', failures_key)
+    if count >= threshold then
+        local lock_ms = math.min(max_lock, base * 2 ^ (count - threshold))
+        redis.call('SET', lock_key, count, 'PX', math.floor(lock_ms))
+    end
+    return count
+end
+
+return {
+    record(KEYS[1], KEYS[2], tonumber(ARGV[2])),
+    record(KEYS[3], KEYS[4], tonumber(ARGV[3])),
+}
+"""
+
+
+def _email_key(email: str) -> str:
+    # Hash so raw addresses are not stored as Redis keys
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+
+class LoginThrottle:
+    """Sliding-window failure counters with exponential lockout."""
+
+    def __init__(self):
+        self._script = None
+
+    @staticmethod
+    def _keys(email: str, ip: str) -> list[str]:
+        email_id = _email_key(email)
+        return [
+            f"login:failures:email:{email_id}",
+            f"login:lock:email:{email_id}",
+            f"login:failures:ip:{ip}",
+            f"login:lock:ip:{ip}",
+        ]
+
+    async def check(self, email: str, ip: str) -> Optional[int]:
+        """
+        Check whether a login attempt may proceed.
+
+        Args:
+            email: Email being logged into
+            ip: Client IP address
+
+        Returns:
+            Seconds until the attempt may be retried, or None if allowed
+        """
+        if not redis_client.redis:
+            return None
+
+        _, email_lock, _, ip_lock = self._keys(email, ip)
+        try:
+            pipe = redis_client.redis.pipeline(transaction=False)
+            pipe.pttl(email_lock)
+            pipe.pttl(ip_lock)
+            email_ttl, ip_ttl = await pipe.execute()
+        except Exception as e:
+            logger.warning("login_throttle_check_failed", error=str(e))
+            return None
+
+        # PTTL is negative when the lock key does not exist
+        if email_ttl > 0 or ip_ttl > 0:
+            scope = "email" if email_ttl >= ip_ttl else "ip"
+            LOGIN_THROTTLE_REJECTED.labels(scope=scope).inc()
+            return max(1, math.ceil(max(email_ttl, ip_ttl) / 1000))
+
+        return None
+
+    async def record_failure(self, email: str, ip: str) -> None:
+        """
+        Record a failed login for both the email and the IP.
+
+        Args:
+            email: Email that failed to log in
+            ip: Client IP address
+        """
+        LOGIN_FAILURES.inc()
+        if not redis_client.redis:
+            return
+
+        if self._script is None:
+            self._script = redis_client.redis.register_script(RECORD_FAILURE_LUA)
+
+        try:
+            await self._script(
+                keys=self._keys(email, ip),
+                args=[
+                    settings.LOGIN_FAILURE_WINDOW_SECONDS * 1000,
+                    settings.LOGIN_MAX_FAILURES_PER_EMAIL,
+                    settings.LOGIN_MAX_FAILURES_PER_IP,
+                    settings.LOGIN_LOCKOUT_BASE_SECONDS * 1000,
+                    settings.LOGIN_LOCKOUT_MAX_SECONDS * 1000,
+                    uuid.uuid4().hex,
+                ],
+            )
+        except Exception as e:
+            logger.warning("login_failure_record_failed", error=str(e))
+
+    async def reset(self, email: str) -> None:
+        """
+        Clear the email's failure window after a successful login.
+
+        Args:
+            email: Email that logged in
+        """
+        if not redis_client.redis:
+            return
+
+        failures, lock, _, _ = self._keys(email, "")
+        try:
+            await redis_client.redis.delete(failures, lock)
+        except Exception as e:
+            logger.warning("login_throttle_reset_failed", error=str(e))
+
+
+# Global login throttle instance
+login_throttle = LoginThrottle()
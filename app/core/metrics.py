@@ -0,0 +1,245 @@
+"""
+Application-level Prometheus metrics.
+
+HTTP request metrics come from prometheus-fastapi-instrumentator; metrics
+defined here cover internals the instrumentator cannot see. They are
+registered in the default registry and exposed on the same endpoint.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+# Outbox relay
+OUTBOX_EVENTS_PUBLISHED = Counter(
+    "outbox_events_published_total",
+    "Outbox events published to Redis Streams",
+    ["aggregate_type"],
+)
+OUTBOX_PUBLISH_ERRORS = Counter(
+    "outbox_publish_errors_total",
+    "Outbox relay batches that failed to publish",
+)
+OUTBOX_RELAY_LAG = Gauge(
+    "outbox_relay_lag_seconds",
+    "Age of the oldest unpublished outbox event",
+)
+OUTBOX_PUBLISH_DELAY = Histogram(
+    "outbox_event_publish_delay_seconds",
+    "Time between an outbox event being committed and published",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+OUTBOX_BATCH_SIZE = Histogram(
+    "outbox_relay_batch_size",
+    "Number of events published per relay batch",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+# Password hashing pool
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_pending",
+    "Password hash operations admitted to the pool (queued + running)",
+)
+PASSWORD_HASH_QUEUE_WAIT = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Time a password hash operation waited for a pool worker",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a password",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Password hash operations rejected because the pool was saturated",
+    ["operation"],
+)
+
+# Verified-token cache
+TOKEN_CACHE_LOOKUPS = Counter(
+    "token_cache_lookups_total",
+    "Verified-token cache lookups",
+    ["result"],
+)
+TOKEN_CACHE_EVICTIONS = Counter(
+    "token_cache_evictions_total",
+    "Verified-token cache evictions",
+    ["reason"],
+)
+
+# Redis client
+REDIS_BREAKER_STATE = Gauge(
+    "redis_circuit_state",
+    "Redis circuit breaker state (0 closed, 1 half-open, 2 open)",
+)
+REDIS_BREAKER_TRANSITIONS = Counter(
+    "redis_circuit_transitions_total",
+    "Redis circuit breaker state changes by new state",
+    ["state"],
+)
+REDIS_FAILED_OPEN = Counter(
+    "redis_failed_open_total",
+    "Redis operations that failed and were treated as a miss or skipped",
+    ["operation"],
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "RedisClient operation latency by key namespace",
+    ["operation", "namespace"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5),
+)
+REDIS_CACHE_LOOKUPS = Counter(
+    "redis_cache_lookups_total",
+    "Cached value reads from Redis by key namespace and result",
+    ["namespace", "result"],
+)
+REDIS_POOL_IN_USE = Gauge(
+    "redis_pool_connections_in_use",
+    "Redis connections currently checked out",
+    ["pool"],
+)
+REDIS_POOL_WAIT = Histogram(
+    "redis_pool_wait_seconds",
+    "Time spent waiting for a Redis connection from the pool",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+REDIS_POOL_TIMEOUTS = Counter(
+    "redis_pool_timeouts_total",
+    "Redis connection checkouts that timed out waiting for a free connection",
+    ["pool"],
+)
+
+# Two-tier cache
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Two-tier cache lookups by tier and result",
+    ["tier", "result"],
+)
+CACHE_L1_BYTES = Gauge(
+    "cache_l1_bytes",
+    "Serialized size of the values held in the in-process cache",
+)
+CACHE_L1_ENTRIES = Gauge(
+    "cache_l1_entries",
+    "Entries held in the in-process cache",
+)
+CACHE_L1_EVICTIONS = Counter(
+    "cache_l1_evictions_total",
+    "In-process cache evictions",
+    ["reason"],
+)
+CACHE_INVALIDATIONS = Counter(
+    "cache_invalidations_received_total",
+    "In-process cache entries dropped on invalidations from other pods",
+)
+CACHE_RECOMPUTES = Counter(
+    "cache_recomputes_total",
+    "Cached values computed, on a miss or refreshed early before expiry",
+    ["reason"],
+)
+CACHE_COALESCED = Counter(
+    "cache_coalesced_total",
+    "Cache misses served by another caller's computation instead of their own",
+    ["scope"],
+)
+
+# Rate limiting
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "Rate limiter decisions (local = served from a local lease)",
+    ["policy", "decision"],
+)
+
+# Login throttling
+LOGIN_FAILURES = Counter(
+    "login_failures_total",
+    "Failed login attempts (bad email or password)",
+)
+LOGIN_THROTTLE_REJECTED = Counter(
+    "login_throttle_rejected_total",
+    "Login attempts rejected by lockout before touching the database",
+    ["scope"],
+)
+
+# Refresh tokens
+REFRESH_TOKEN_ROTATIONS = Counter(
+    "refresh_token_rotations_total",
+    "Refresh token exchanges by outcome",
+    ["result"],
+)
+
+# Database connection pool
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured persistent connections in the pool",
+    ["pool"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Overflow connections currently open beyond the pool size",
+    ["pool"],
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent acquiring a connection from the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Connection checkouts that timed out waiting for the pool",
+    ["pool"],
+)
+
+# Read replicas
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Replication lag reported by each read replica",
+    ["replica"],
+)
+DB_REPLICA_HEALTHY = Gauge(
+    "db_replica_healthy",
+    "Whether a replica is currently eligible for reads (1) or not (0)",
+    ["replica"],
+)
+DB_READ_ROUTED = Counter(
+    "db_read_sessions_total",
+    "Read-only sessions by target database",
+    ["target", "reason"],
+)
+
+# SQL statements
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time by statement fingerprint",
+    ["fingerprint", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements run per HTTP request",
+    ["route"],
+    buckets=(1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50, 100),
+)
+DB_QUERY_TIME_PER_REQUEST = Histogram(
+    "db_query_time_per_request_seconds",
+    "Total SQL statement time per HTTP request",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_QUERY_BUDGET_EXCEEDED = Counter(
+    "db_query_budget_exceeded_total",
+    "Requests that ran more SQL statements than their route's budget",
+    ["route"],
+)
+
+# Startup
+WARMUP_DURATION = Gauge(
+    "app_warmup_duration_seconds",
+    "Time the last startup warmup took before the pod reported ready",
+)
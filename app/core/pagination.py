@@ -0,0 +1,46 @@
+"""
+Keyset (cursor) pagination helpers.
+"""
+import base64
+import binascii
+from datetime import datetime
+from fastapi import HTTPException, status
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode a keyset position into an opaque cursor.
+
+    Args:
+        created_at: Sort timestamp of the last row on the page
+        row_id: Primary key of the last row on the page (tie-breaker)
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        Tuple of (created_at, id)
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from e
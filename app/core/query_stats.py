@@ -0,0 +1,191 @@
+"""
+Per-request SQL statement accounting.
+
+Engine events time every statement and attribute it to the request being
+served, keyed by a fingerprint of the statement with literals and bind
+parameters stripped, so all executions of the same query share a series.
+Only the first QUERY_FINGERPRINT_LABELS fingerprints a process sees get a
+series of their own (the hot statements run first and most often); later
+ones are exported as "other" so ad-hoc SQL cannot grow the label set
+without bound. Logs always carry the real fingerprint.
+Statements slower than SLOW_QUERY_MS are logged with the route that ran
+them. Routes can declare a query budget with query_budget(); going over
+it is logged and counted, and raises when QUERY_BUDGET_ENFORCE is set,
+so N+1 regressions fail loudly instead of only adding latency;
+scripts/check_query_budgets.py runs every budgeted route that way.
+"""
+import hashlib
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import AsyncGenerator, Optional
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import (
+    DB_QUERY_DURATION, DB_QUERIES_PER_REQUEST, DB_QUERY_TIME_PER_REQUEST,
+    DB_QUERY_BUDGET_EXCEEDED,
+)
+
+logger = structlog.get_logger()
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\$\d+|%\(\w+\)s|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A route ran more SQL statements than its declared budget."""
+
+
+@dataclass
+class RequestQueries:
+    """Statements run on behalf of one request."""
+    scope: Scope
+    count: int = 0
+    duration: float = 0.0
+
+    @property
+    def route(self) -> str:
+        # Set by the router once the request has been matched
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+# Fingerprints exported as their own metric label
+_labelled_fingerprints: set[str] = set()
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> tuple[str, str]:
+    """
+    Normalize a SQL statement so executions with different values match.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        Tuple of (12-character fingerprint, normalized SQL)
+    """
+    normalized = _LITERALS.sub("?", statement)
+    normalized = _IN_LISTS.sub("(?+)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    return digest, normalized
+
+
+def fingerprint_label(digest: str, normalized: str) -> str:
+    """
+    Metric label for a fingerprint, capped at QUERY_FINGERPRINT_LABELS.
+
+    Args:
+        digest: Fingerprint from fingerprint()
+        normalized: Normalized SQL, logged when the fingerprint gets a label
+
+    Returns:
+        The fingerprint, or "other" once the cap is reached
+    """
+    if digest in _labelled_fingerprints:
+        return digest
+    if len(_labelled_fingerprints) >= settings.QUERY_FINGERPRINT_LABELS:
+        return "other"
+    _labelled_fingerprints.add(digest)
+    # Maps the label to its SQL for dashboards
+    logger.info("query_fingerprint_labelled", fingerprint=digest, statement=normalized[:2000])
+    return digest
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+    digest, normalized = fingerprint(statement)
+    operation = normalized.split(" ", 1)[0].upper()
+    DB_QUERY_DURATION.labels(
+        fingerprint=fingerprint_label(digest, normalized), operation=operation,
+    ).observe(elapsed)
+
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "slow_query",
+            fingerprint=digest,
+            statement=normalized[:2000],
+            duration_ms=round(elapsed * 1000, 1),
+            route=stats.route if stats else None,
+        )
+
+
+def query_budget(max_queries: int):
+    """
+    Route dependency declaring how many statements a route may run.
+
+    Usage:
+        @router.get("/", dependencies=[Depends(query_budget(2))])
+
+    Args:
+        max_queries: Statements allowed per request, including eager loads
+
+    Returns:
+        Dependency function
+    """
+    async def check_budget() -> AsyncGenerator[None, None]:
+        stats = _current.get()
+        yield
+        if stats is None:
+            return
+
+        # Route dependencies are torn down after the session dependencies,
+        # so this sees every statement the request ran
+        if stats.count > max_queries:
+            DB_QUERY_BUDGET_EXCEEDED.labels(route=stats.route).inc()
+            logger.warning(
+                "query_budget_exceeded",
+                route=stats.route,
+                queries=stats.count,
+                budget=max_queries,
+            )
+            if settings.QUERY_BUDGET_ENFORCE:
+                raise QueryBudgetExceeded(
+                    f"{stats.route} ran {stats.count} queries (budget {max_queries})"
+                )
+
+    return check_budget
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting per-request statement counts and time."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueries(scope=scope)
+        token = _current.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            if stats.count:
+                route = stats.route
+                DB_QUERIES_PER_REQUEST.labels(route=route).observe(stats.count)
+                DB_QUERY_TIME_PER_REQUEST.labels(route=route).observe(stats.duration)
@@ -0,0 +1,267 @@
+"""
+Distributed rate limiting.
+
+Requests are limited with a token bucket stored in Redis and updated by an
+atomic Lua script, so all API replicas share one budget per client. To
+avoid a Redis round trip on every request, a client with plenty of tokens
+left is granted a small lease of tokens that this process then spends
+locally; a lease is never larger than what Redis actually deducted, so the
+shared limit is never exceeded.
+
+Anonymous clients are keyed by IP. X-Real-IP is only believed when it
+comes from one of RATE_LIMIT_TRUSTED_PROXIES; a client talking to the API
+directly could otherwise pick a new address, and so a fresh bucket and
+login lockout counter, on every request.
+"""
+import ipaddress
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+import structlog
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_DECISIONS
+from app.core.redis import redis_client
+from app.core.token_cache import request_user_id
+
+logger = structlog.get_logger()
+
+# KEYS[1] bucket key
+# ARGV[1] refill rate (tokens/second), ARGV[2] capacity, ARGV[3] lease size
+# Returns {granted tokens, tokens left, retry after (ms)}
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local lease = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local granted = 0
+local retry_after_ms = 0
+if tokens >= 1 then
+    if tokens >= lease * 2 then
+        granted = lease
+    else
+        granted = 1
+    end
+    tokens = tokens - granted
+else
+    retry_after_ms = math.ceil((1 - tokens) / rate * 1000)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {granted, math.floor(tokens), retry_after_ms}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Token bucket parameters for a class of requests."""
+    name: str
+    per_minute: int
+    burst: int
+    key_by_user: bool = True  # fall back to client IP for anonymous requests
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    """Maps a path prefix (and optionally methods) to a policy."""
+    prefix: str
+    policy: RateLimitPolicy
+    methods: Optional[frozenset[str]] = None
+
+
+DEFAULT_POLICY = RateLimitPolicy(
+    name="default",
+    per_minute=settings.RATE_LIMIT_PER_MINUTE,
+    burst=settings.RATE_LIMIT_BURST,
+)
+
+# First match wins; unmatched API requests use DEFAULT_POLICY
+ROUTE_POLICIES: list[RoutePolicy] = [
+    RoutePolicy(
+        prefix=f"{settings.API_V1_PREFIX}/auth/",
+        policy=RateLimitPolicy(name="auth", per_minute=10, burst=20, key_by_user=False),
+    ),
+    RoutePolicy(
+        prefix=f"{settings.API_V1_PREFIX}/",
+        methods=frozenset({"POST", "PUT", "PATCH", "DELETE"}),
+        policy=RateLimitPolicy(name="write", per_minute=30, burst=30),
+    ),
+]
+
+EXEMPT_PREFIXES = ("/health", settings.METRICS_PATH, "/docs", "/redoc", "/openapi.json")
+
+
+def resolve_policy(method: str, path: str) -> Optional[RateLimitPolicy]:
+    """
+    Find the policy for a request.
+
+    Args:
+        method: HTTP method
+        path: Request path
+
+    Returns:
+        Matching policy, or None if the path is exempt
+    """
+    if path.startswith(EXEMPT_PREFIXES):
+        return None
+    for route in ROUTE_POLICIES:
+        if path.startswith(route.prefix) and (route.methods is None or method in route.methods):
+            return route.policy
+    return DEFAULT_POLICY
+
+
+TRUSTED_PROXIES = tuple(
+    ipaddress.ip_network(proxy, strict=False) for proxy in settings.RATE_LIMIT_TRUSTED_PROXIES
+)
+
+
+def is_trusted_proxy(address: str) -> bool:
+    """Whether a peer address belongs to RATE_LIMIT_TRUSTED_PROXIES."""
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(scope: Scope) -> str:
+    """Client address, honouring X-Real-IP only from a trusted proxy."""
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+    if settings.RATE_LIMIT_TRUST_PROXY and is_trusted_proxy(peer):
+        for name, value in scope["headers"]:
+            if name == b"x-real-ip":
+                return value.decode("latin-1")
+    return peer
+
+
+class RateLimiter:
+    """Redis token bucket with a local lease pre-filter."""
+
+    def __init__(
+        self,
+        lease_size: int = settings.RATE_LIMIT_LEASE_SIZE,
+        lease_ttl: float = settings.RATE_LIMIT_LEASE_TTL,
+        max_local_keys: int = 10_000,
+    ):
+        self.lease_size = max(1, lease_size)
+        self.lease_ttl = lease_ttl
+        self.max_local_keys = max_local_keys
+        # bucket key -> (tokens left in lease, lease expiry)
+        self._leases: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._script = None
+
+    def _take_local(self, key: str) -> bool:
+        lease = self._leases.get(key)
+        if lease is None:
+            return False
+        remaining, expires_at = lease
+        if remaining <= 0 or expires_at <= time.monotonic():
+            del self._leases[key]
+            return False
+        self._leases[key] = (remaining - 1, expires_at)
+        return True
+
+    def _store_lease(self, key: str, tokens: int) -> None:
+        self._leases[key] = (tokens, time.monotonic() + self.lease_ttl)
+        self._leases.move_to_end(key)
+        while len(self._leases) > self.max_local_keys:
+            self._leases.popitem(last=False)
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> tuple[bool, int]:
+        """
+        Consume one token for a request.
+
+        Args:
+            key: Bucket key
+            policy: Policy the bucket follows
+
+        Returns:
+            Tuple of (allowed, retry after in seconds)
+        """
+        if self._take_local(key):
+            RATE_LIMIT_DECISIONS.labels(policy=policy.name, decision="local").inc()
+            return True, 0
+
+        if not redis_client.redis:
+            return True, 0
+
+        if self._script is None:
+            self._script = redis_client.redis.register_script(TOKEN_BUCKET_LUA)
+
+        try:
+            granted, _, retry_after_ms = await self._script(
+                keys=[key],
+                args=[policy.per_minute / 60, policy.burst, self.lease_size],
+            )
+        except Exception as e:
+            # Fail open: a Redis outage must not take the API down with it
+            RATE_LIMIT_DECISIONS.labels(policy=policy.name, decision="error").inc()
+            logger.warning("rate_limit_check_failed", error=str(e))
+            return True, 0
+
+        granted = int(granted)
+        if granted <= 0:
+            RATE_LIMIT_DECISIONS.labels(policy=policy.name, decision="rejected").inc()
+            return False, max(1, math.ceil(int(retry_after_ms) / 1000))
+
+        if granted > 1:
+            self._store_lease(key, granted - 1)
+
+        RATE_LIMIT_DECISIONS.labels(policy=policy.name, decision="allowed").inc()
+        return True, 0
+
+
+# Global rate limiter instance
+rate_limiter = RateLimiter()
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing ROUTE_POLICIES with 429 + Retry-After."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        policy = resolve_policy(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        user_id = request_user_id(scope) if policy.key_by_user else None
+        identity = f"user:{user_id}" if user_id is not None else f"ip:{client_ip(scope)}"
+
+        allowed, retry_after = await rate_limiter.hit(
+            f"ratelimit:{policy.name}:{identity}", policy
+        )
+        if not allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests"},
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -1,10 +1,375 @@
 """
 Redis connection and caching utilities.
+
+Cached values (get/set/mget/mset and batch get/set) are encoded by
+app.core.codecs and go through a binary connection pool. Everything else,
+including Lua scripts and streams used elsewhere, uses `redis`, which
+decodes responses to str.
+
+Redis is a cache here, so its failures must cost latency, not
+availability. Every connection has socket and connect timeouts, and
+every connection of both pools reports to one circuit breaker. After
+REDIS_BREAKER_FAILURES consecutive errors, commands fail immediately with
+CircuitOpenError instead of waiting on a dead server. After
+REDIS_BREAKER_RESET_SECONDS one probe command is let through; its outcome
+closes the breaker or keeps it open. RedisClient methods fail open on
+any Redis error: reads return a miss and writes are skipped.
+
+Callers using `redis` directly handle errors themselves, and none of
+them may turn an outage into a failed request: the rate limiter and
+login throttle let requests through, read-your-writes pins reads to the
+primary, refresh tokens are still issued at login (refreshing answers
+503) and the outbox relay retries.
+
+RedisClient operations are timed and cached reads counted as hits or
+misses, labelled by key namespace (the prefix before the first ':'), so
+keys have to be namespaced for their metrics to be useful.
 """
-import json
-from typing import Optional, Any
+import asyncio
+import functools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Iterable, Mapping, Optional, Any, Union
+import structlog
 from redis import asyncio as aioredis
+from redis.asyncio.connection import AbstractConnection
+from redis.exceptions import (
+    ConnectionError as RedisConnectionError, RedisError, TimeoutError as RedisTimeoutError,
+)
+from app.core.codecs import CodecError, value_codec
 from app.core.config import settings
+from app.core.metrics import (
+    REDIS_BREAKER_STATE, REDIS_BREAKER_TRANSITIONS, REDIS_FAILED_OPEN,
+    REDIS_COMMAND_DURATION, REDIS_CACHE_LOOKUPS,
+    REDIS_POOL_IN_USE, REDIS_POOL_WAIT, REDIS_POOL_TIMEOUTS,
+)
+
+logger = structlog.get_logger()
+
+
+class CircuitOpenError(RedisConnectionError):
+    """Redis is considered down; the command was not sent."""
+
+
+# Errors that mean Redis is unreachable or too slow, as opposed to a
+# command error such as NOSCRIPT or WRONGTYPE
+_UNAVAILABLE = (RedisConnectionError, RedisTimeoutError, OSError)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with single-probe half-open state."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        failure_threshold: int = settings.REDIS_BREAKER_FAILURES,
+        reset_timeout: float = settings.REDIS_BREAKER_RESET_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._changed_at = 0.0  # when the breaker opened or the probe started
+        REDIS_BREAKER_STATE.set(0)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        self._changed_at = time.monotonic()
+        REDIS_BREAKER_STATE.set(self._STATE_VALUES[state])
+        REDIS_BREAKER_TRANSITIONS.labels(state=state).inc()
+        log = logger.info if state == self.CLOSED else logger.warning
+        log("redis_circuit_" + state, failures=self.failures)
+
+    @property
+    def rejecting(self) -> bool:
+        """Whether commands fail fast right now (open and not yet due a probe)."""
+        return (
+            self.state == self.OPEN
+            and time.monotonic() - self._changed_at < self.reset_timeout
+        )
+
+    def allow(self) -> bool:
+        """
+        Decide whether a command may be sent.
+
+        Returns:
+            True when closed, or when this command is the half-open probe
+        """
+        if self.state == self.CLOSED:
+            return True
+        if time.monotonic() - self._changed_at < self.reset_timeout:
+            return False
+        # Due a probe; a probe that never reported back is replaced
+        self._transition(self.HALF_OPEN)
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self._transition(self.OPEN)
+
+
+# Shared by every Redis connection in the process
+breaker = CircuitBreaker()
+
+
+def _record_failure(error: BaseException) -> None:
+    # connect() sends commands of its own; count each error once, and
+    # never count the breaker's own rejections
+    if isinstance(error, CircuitOpenError) or getattr(error, "_breaker_counted", False):
+        return
+    error._breaker_counted = True
+    breaker.record_failure()
+
+
+class BreakerGuard:
+    """Connection mixin that reports command outcomes to the circuit breaker."""
+
+    # Set on the connection admitted as the half-open probe; it may send
+    # (including its connection handshake) until its first reply or error
+    _probe = False
+
+    async def connect(self):
+        if self.is_connected:
+            return
+        if not breaker.allow():
+            raise CircuitOpenError("Redis circuit open")
+        self._probe = breaker.state == breaker.HALF_OPEN
+        try:
+            await super().connect()
+        except _UNAVAILABLE as e:
+            self._probe = False
+            _record_failure(e)
+            raise
+
+    async def send_packed_command(self, command, check_health=True):
+        if not self._probe and not breaker.allow():
+            raise CircuitOpenError("Redis circuit open")
+        if breaker.state == breaker.HALF_OPEN:
+            self._probe = True
+        try:
+            await super().send_packed_command(command, check_health)
+        except _UNAVAILABLE as e:
+            self._probe = False
+            _record_failure(e)
+            raise
+
+    async def read_response(self, *args, **kwargs):
+        try:
+            response = await super().read_response(*args, **kwargs)
+        except _UNAVAILABLE as e:
+            self._probe = False
+            _record_failure(e)
+            raise
+        # A caller-supplied timeout (pub/sub polling) returns None when idle
+        if response is not None or kwargs.get("timeout") is None:
+            self._probe = False
+            breaker.record_success()
+        return response
+
+
+def _guarded(connection_class: type[AbstractConnection]) -> type[AbstractConnection]:
+    return type(f"Guarded{connection_class.__name__}", (BreakerGuard, connection_class), {})
+
+
+class InstrumentedPool(aioredis.BlockingConnectionPool):
+    """
+    Blocking pool that records how long callers wait for a connection.
+
+    Callers wait up to REDIS_POOL_TIMEOUT for a free connection instead of
+    failing at once when all REDIS_MAX_CONNECTIONS are busy.
+    """
+
+    name = "redis"
+
+    async def get_connection(self, command_name, *keys, **options):
+        started_at = time.perf_counter()
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError as e:
+            if isinstance(e.__cause__, asyncio.TimeoutError):
+                REDIS_POOL_TIMEOUTS.labels(pool=self.name).inc()
+            raise
+        finally:
+            REDIS_POOL_WAIT.labels(pool=self.name).observe(time.perf_counter() - started_at)
+
+
+def create_redis(name: str, **options: Any) -> aioredis.Redis:
+    """
+    Create a client for REDIS_URL with timeouts and the circuit breaker.
+
+    Args:
+        name: Pool label for metrics
+        options: Extra connection options, e.g. decode_responses
+
+    Returns:
+        Redis client owning its connection pool
+    """
+    pool_class = type(f"InstrumentedPool[{name}]", (InstrumentedPool,), {"name": name})
+    pool = pool_class.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+        **options,
+    )
+    # Set after from_url, which picks the class from the URL scheme
+    pool.connection_class = _guarded(pool.connection_class)
+    REDIS_POOL_IN_USE.labels(pool=name).set_function(lambda: len(pool._in_use_connections))
+    return aioredis.Redis.from_pool(pool)
+
+
+def decode_value(data: Optional[bytes]) -> Optional[Any]:
+    """Decode a stored value; undecodable values are treated as missing."""
+    return decode_value_sized(data)[0]
+
+
+def decode_value_sized(data: Optional[bytes]) -> tuple[Optional[Any], int]:
+    """decode_value() plus the value's serialized size before compression."""
+    try:
+        return value_codec.decode_sized(data)
+    except CodecError as e:
+        logger.warning("cache_value_undecodable", error=str(e))
+        return None, 0
+
+
+def namespace(key: Any) -> str:
+    """Metrics label for a key: its prefix before the first ':'."""
+    if isinstance(key, bytes):
+        key = key.decode(errors="replace")
+    prefix, separator, _ = str(key).partition(":")
+    return prefix if separator else "none"
+
+
+def _first_key(args: tuple) -> Any:
+    if not args:
+        return ""
+    first = args[0]
+    if isinstance(first, (str, bytes)):
+        return first
+    return next(iter(first), "")
+
+
+def instrumented(operation: str):
+    """
+    Time a RedisClient operation by the namespace of its first key.
+
+    Calls that fail fast because Redis is unavailable are not timed.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if not self.available:
+                return await method(self, *args, **kwargs)
+            started_at = time.perf_counter()
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                REDIS_COMMAND_DURATION.labels(
+                    operation=operation, namespace=namespace(_first_key(args)),
+                ).observe(time.perf_counter() - started_at)
+        return wrapper
+    return decorator
+
+
+def _record_lookup(key: Any, data: Optional[bytes]) -> None:
+    REDIS_CACHE_LOOKUPS.labels(
+        namespace=namespace(key), result="miss" if data is None else "hit",
+    ).inc()
+
+
+def _failed_open(operation: str, error: RedisError) -> None:
+    REDIS_FAILED_OPEN.labels(operation=operation).inc()
+    # The breaker logs outages; only log errors while it is still closed
+    if not isinstance(error, CircuitOpenError):
+        logger.debug("redis_operation_failed", operation=operation, error=str(error))
+
+
+class RedisBatch:
+    """
+    Commands queued on a pipeline and sent in a single round trip.
+
+    Values go through the same encoding as RedisClient.get/set.
+    Results are available in queue order after the batch has executed.
+    """
+
+    def __init__(self, pipe: Optional[Any]):
+        self._pipe = pipe
+        self._decoders: list[Optional[Callable[[Any], Any]]] = []
+        self._gets: dict[int, str] = {}  # queue position -> key, for hit/miss counts
+        self._first_key: Any = ""
+        self.results: list[Any] = []
+
+    def _queue(self, command: str, *args: Any, decoder=None, **kwargs: Any) -> "RedisBatch":
+        if self._pipe is not None:
+            getattr(self._pipe, command)(*args, **kwargs)
+        if not self._decoders:
+            self._first_key = args[0]
+        self._decoders.append(decoder)
+        return self
+
+    def get(self, key: str) -> "RedisBatch":
+        self._gets[len(self._decoders)] = key
+        return self._queue("get", key, decoder=decode_value)
+
+    def set(self, key: str, value: Any, expire: Optional[int] = None) -> "RedisBatch":
+        return self._queue("set", key, value_codec.encode(value), ex=expire)
+
+    def delete(self, *keys: str) -> "RedisBatch":
+        return self._queue("delete", *keys)
+
+    def incr(self, key: str, amount: int = 1) -> "RedisBatch":
+        return self._queue("incrby", key, amount)
+
+    def expire(self, key: str, seconds: int) -> "RedisBatch":
+        return self._queue("expire", key, seconds)
+
+    def __len__(self) -> int:
+        return len(self._decoders)
+
+    async def execute(self) -> list[Any]:
+        """
+        Send the queued commands.
+
+        Returns:
+            One result per queued command; all None when Redis is unavailable
+        """
+        if self._pipe is None:
+            self.results = [None] * len(self._decoders)
+        elif not self._decoders:
+            self.results = []
+        else:
+            started_at = time.perf_counter()
+            try:
+                raw = await self._pipe.execute()
+            except RedisError as e:
+                _failed_open("pipeline", e)
+                raw = [None] * len(self._decoders)
+            else:
+                REDIS_COMMAND_DURATION.labels(
+                    operation="pipeline", namespace=namespace(self._first_key),
+                ).observe(time.perf_counter() - started_at)
+                for position, key in self._gets.items():
+                    _record_lookup(key, raw[position])
+            self.results = [
+                decoder(value) if decoder else value
+                for decoder, value in zip(self._decoders, raw)
+            ]
+        self._decoders = []
+        self._gets = {}
+        return self.results
 
 
 class RedisClient:
@@ -12,32 +377,70 @@ class RedisClient:
 
     def __init__(self):
         self.redis: Optional[aioredis.Redis] = None
+        # Same server, responses left as bytes for encoded values
+        self.binary: Optional[aioredis.Redis] = None
 
     async def connect(self):
         """Establish Redis connection."""
-        self.redis = await aioredis.from_url(
-            settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True,
-            max_connections=10,
-        )
+        self.redis = create_redis("text", encoding="utf-8", decode_responses=True)
+        self.binary = create_redis("binary")
 
     async def disconnect(self):
         """Close Redis connection."""
         if self.redis:
             await self.redis.close()
+        if self.binary:
+            await self.binary.close()
+
+    @property
+    def available(self) -> bool:
+        """Connected and not failing fast."""
+        return self.redis is not None and not breaker.rejecting
+
+    @instrumented("get")
+    async def get_raw(self, key: str) -> Optional[bytes]:
+        """Get an encoded value as stored."""
+        if not self.available:
+            return None
+        try:
+            data = await self.binary.get(key)
+        except RedisError as e:
+            _failed_open("get", e)
+            return None
+        _record_lookup(key, data)
+        return data
+
+    @instrumented("set")
+    async def set_raw(self, key: str, data: bytes, expire: Optional[int] = None) -> bool:
+        """Store an already encoded value."""
+        if not self.available:
+            return False
+        try:
+            await self.binary.set(key, data, ex=expire)
+        except RedisError as e:
+            _failed_open("set", e)
+            return False
+        return True
+
+    @instrumented("mget")
+    async def mget_raw(self, keys: list[str]) -> list[Optional[bytes]]:
+        """Get several encoded values as stored, in key order."""
+        if not keys:
+            return []
+        if not self.available:
+            return [None] * len(keys)
+        try:
+            values = await self.binary.mget(keys)
+        except RedisError as e:
+            _failed_open("mget", e)
+            return [None] * len(keys)
+        for key, data in zip(keys, values):
+            _record_lookup(key, data)
+        return values
 
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
-        if not self.redis:
-            return None
-        value = await self.redis.get(key)
-        if value:
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
-        return None
+        return decode_value(await self.get_raw(key))
 
     async def set(
         self,
@@ -56,39 +459,172 @@ class RedisClient:
         Returns:
             True if successful
         """
-        if not self.redis:
-            return False
-
-        if not isinstance(value, str):
-            value = json.dumps(value)
+        return await self.set_raw(key, value_codec.encode(value), expire)
 
-        await self.redis.set(key, value, ex=expire)
-        return True
-
-    async def delete(self, key: str) -> bool:
-        """Delete key from cache."""
-        if not self.redis:
+    @instrumented("delete")
+    async def delete(self, *keys: str) -> bool:
+        """Delete keys from cache."""
+        if not keys or not self.available:
+            return False
+        try:
+            await self.redis.delete(*keys)
+        except RedisError as e:
+            _failed_open("delete", e)
             return False
-        await self.redis.delete(key)
         return True
 
+    @instrumented("exists")
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
-        if not self.redis:
+        if not self.available:
+            return False
+        try:
+            return await self.redis.exists(key) > 0
+        except RedisError as e:
+            _failed_open("exists", e)
             return False
-        return await self.redis.exists(key) > 0
 
+    @instrumented("incr")
     async def incr(self, key: str, amount: int = 1) -> int:
         """Increment counter."""
-        if not self.redis:
+        if not self.available:
+            return 0
+        try:
+            return await self.redis.incrby(key, amount)
+        except RedisError as e:
+            _failed_open("incr", e)
             return 0
-        return await self.redis.incrby(key, amount)
 
+    @instrumented("expire")
     async def expire(self, key: str, seconds: int) -> bool:
         """Set expiration on key."""
-        if not self.redis:
+        if not self.available:
             return False
-        return await self.redis.expire(key, seconds)
+        try:
+            return await self.redis.expire(key, seconds)
+        except RedisError as e:
+            _failed_open("expire", e)
+            return False
+
+    async def mget(self, keys: Iterable[str]) -> list[Optional[Any]]:
+        """
+        Get several values in one round trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Values in key order, None for missing keys
+        """
+        return [decode_value(data) for data in await self.mget_raw(list(keys))]
+
+    async def mset(
+        self,
+        mapping: Mapping[str, Any],
+        expire: Union[int, Mapping[str, int], None] = None,
+    ) -> bool:
+        """
+        Set several values in one round trip.
+
+        Args:
+            mapping: Key to value
+            expire: Expiration in seconds for every key, or a per-key mapping
+                (keys missing from it do not expire)
+
+        Returns:
+            True if successful
+        """
+        if not self.available:
+            return False
+        if not mapping:
+            return True
+
+        if expire is None:
+            return await self._mset(
+                {key: value_codec.encode(value) for key, value in mapping.items()}
+            )
+
+        # MSET cannot set TTLs, so pipeline one SET per key instead
+        async with self.pipeline() as batch:
+            for key, value in mapping.items():
+                ttl = expire.get(key) if isinstance(expire, Mapping) else expire
+                batch.set(key, value, expire=ttl)
+        return all(result is not None for result in batch.results)
+
+    @instrumented("mset")
+    async def _mset(self, encoded: Mapping[str, bytes]) -> bool:
+        try:
+            await self.binary.mset(encoded)
+        except RedisError as e:
+            _failed_open("mset", e)
+            return False
+        return True
+
+    async def incr_many(
+        self,
+        amounts: Mapping[str, int],
+        expire: Optional[int] = None,
+    ) -> dict[str, int]:
+        """
+        Increment several counters in one round trip.
+
+        Args:
+            amounts: Key to increment
+            expire: Optional expiration in seconds applied to every key
+
+        Returns:
+            Key to new value (0 when Redis is unavailable)
+        """
+        async with self.pipeline() as batch:
+            for key, amount in amounts.items():
+                batch.incr(key, amount)
+                if expire is not None:
+                    batch.expire(key, expire)
+        step = 1 if expire is None else 2
+        return {key: result or 0 for key, result in zip(amounts, batch.results[::step])}
+
+    async def expire_many(self, keys: Iterable[str], seconds: int) -> list[bool]:
+        """
+        Set the same expiration on several keys in one round trip.
+
+        Args:
+            keys: Cache keys
+            seconds: Expiration time in seconds
+
+        Returns:
+            Whether each key existed, in key order
+        """
+        async with self.pipeline() as batch:
+            for key in keys:
+                batch.expire(key, seconds)
+        return [bool(result) for result in batch.results]
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[RedisBatch]:
+        """
+        Queue commands and send them together when the block exits.
+
+        Usage:
+            async with redis_client.pipeline() as batch:
+                batch.get("a").incr("b")
+            a, b = batch.results
+
+        Args:
+            transaction: Wrap the commands in MULTI/EXEC so they apply atomically
+
+        Yields:
+            RedisBatch; nothing is sent if the block raises
+        """
+        if not self.available:
+            batch = RedisBatch(None)
+            yield batch
+            await batch.execute()
+            return
+
+        async with self.binary.pipeline(transaction=transaction) as pipe:
+            batch = RedisBatch(pipe)
+            yield batch
+            await batch.execute()
 
 
 # Global Redis client instance
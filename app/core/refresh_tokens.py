@@ -0,0 +1,181 @@
+"""
+Refresh token rotation backed by Redis token families.
+
+Every login starts a token family. A refresh token carries its family id
+(fam) and its own id (jti); Redis stores the one jti per family that is
+still valid. Refreshing atomically swaps that jti for a new one, so each
+refresh token works exactly once. Presenting an already-rotated token is
+treated as theft: the whole family is revoked and the user must log in
+again. A refresh costs one Redis round trip - no DB query, no bcrypt.
+
+Redis being unavailable must not break logins: issue() still returns a
+token (its family is simply unknown, so refreshing it later fails like a
+revoked token and the user logs in again), rotate() answers 503 and
+revoke() logs and carries on.
+"""
+import uuid
+from typing import Any
+import structlog
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import REFRESH_TOKEN_ROTATIONS
+from app.core.redis import redis_client
+from app.core.security import create_refresh_token, decode_token
+from app.core.token_cache import token_cache
+
+logger = structlog.get_logger()
+
+# KEYS[1] family key
+# ARGV[1] presented jti, ARGV[2] replacement jti, ARGV[3] family TTL (ms)
+# Returns 1 rotated, 0 unknown/revoked family, -1 reuse detected
+ROTATE_LUA = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    return 0
+end
+if current ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return -1
+end
+redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+return 1
+"""
+
+
+def _family_key(family_id: str) -> str:
+    return f"refresh:family:{family_id}"
+
+
+def _family_ttl_ms() -> int:
+    return settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60 * 1000
+
+
+def _store_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Token refresh temporarily unavailable",
+    )
+
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+class RefreshTokenStore:
+    """Issues, rotates and revokes refresh tokens."""
+
+    def __init__(self):
+        self._script = None
+
+    async def issue(self, user_id: int) -> str:
+        """
+        Start a new token family for a fresh login.
+
+        Args:
+            user_id: Authenticated user ID
+
+        Returns:
+            Encoded refresh token
+        """
+        family_id = uuid.uuid4().hex
+        jti = uuid.uuid4().hex
+
+        if redis_client.redis:
+            try:
+                await redis_client.redis.set(_family_key(family_id), jti, px=_family_ttl_ms())
+            except RedisError as e:
+                REFRESH_TOKEN_ROTATIONS.labels(result="issue_failed").inc()
+                logger.warning("refresh_token_issue_failed", user_id=user_id, error=str(e))
+
+        return create_refresh_token(data={"sub": str(user_id), "fam": family_id, "jti": jti})
+
+    async def rotate(self, refresh_token: str) -> tuple[int, str]:
+        """
+        Exchange a refresh token for its successor.
+
+        Args:
+            refresh_token: Encoded refresh token presented by the client
+
+        Returns:
+            Tuple of (user ID, new refresh token)
+
+        Raises:
+            HTTPException: 401 if the token is invalid, revoked or reused;
+                503 if the token store is unavailable
+        """
+        payload = self._decode(refresh_token)
+        user_id = int(payload["sub"])
+        new_jti = uuid.uuid4().hex
+
+        if not redis_client.redis:
+            raise _store_unavailable()
+
+        if self._script is None:
+            self._script = redis_client.redis.register_script(ROTATE_LUA)
+
+        try:
+            outcome = int(await self._script(
+                keys=[_family_key(payload["fam"])],
+                args=[payload["jti"], new_jti, _family_ttl_ms()],
+            ))
+        except RedisError as e:
+            REFRESH_TOKEN_ROTATIONS.labels(result="unavailable").inc()
+            logger.warning("refresh_token_rotate_failed", user_id=user_id, error=str(e))
+            raise _store_unavailable() from e
+
+        if outcome == -1:
+            REFRESH_TOKEN_ROTATIONS.labels(result="reused").inc()
+            logger.warning("refresh_token_reuse_detected", user_id=user_id)
+            # Also stop honouring cached access tokens for the user on this pod
+            token_cache.revoke_subject(user_id)
+            raise _invalid_refresh_token()
+
+        if outcome == 0:
+            REFRESH_TOKEN_ROTATIONS.labels(result="revoked").inc()
+            raise _invalid_refresh_token()
+
+        REFRESH_TOKEN_ROTATIONS.labels(result="rotated").inc()
+        new_token = create_refresh_token(
+            data={"sub": str(user_id), "fam": payload["fam"], "jti": new_jti}
+        )
+        return user_id, new_token
+
+    async def revoke(self, refresh_token: str) -> None:
+        """
+        Revoke the family a refresh token belongs to (logout).
+
+        Args:
+            refresh_token: Encoded refresh token
+
+        Raises:
+            HTTPException: 401 if the token is invalid
+        """
+        payload = self._decode(refresh_token)
+        if redis_client.redis:
+            try:
+                await redis_client.redis.delete(_family_key(payload["fam"]))
+            except RedisError as e:
+                # The family stays valid until it expires; logout still succeeds
+                logger.warning("refresh_token_revoke_failed", user_id=payload["sub"], error=str(e))
+
+    @staticmethod
+    def _decode(refresh_token: str) -> dict[str, Any]:
+        payload = decode_token(refresh_token)
+        if (
+            payload.get("type") != "refresh"
+            or not payload.get("sub")
+            or not payload.get("fam")
+            or not payload.get("jti")
+        ):
+            raise _invalid_refresh_token()
+        return payload
+
+
+# Global refresh token store
+refresh_token_store = RefreshTokenStore()
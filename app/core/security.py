@@ -1,18 +1,33 @@
 """
 Security utilities for authentication and authorization.
 """
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Any
+from typing import Callable, Optional, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
+from app.core.metrics import (
+    PASSWORD_HASH_PENDING, PASSWORD_HASH_QUEUE_WAIT,
+    PASSWORD_HASH_DURATION, PASSWORD_HASH_REJECTED,
+)
+from app.core.token_cache import token_cache
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Bounded pool for bcrypt; the bcrypt extension releases the GIL while hashing
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_password_hash_pending = 0
+
 # HTTP Bearer authentication
 bearer_scheme = HTTPBearer()
 
@@ -44,6 +59,94 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _timed_hash_call(
+    operation: str,
+    submitted_at: float,
+    func: Callable[..., Any],
+    *args: Any,
+) -> Any:
+    """Run a hash operation on a pool worker, recording wait and run time."""
+    started_at = time.perf_counter()
+    PASSWORD_HASH_QUEUE_WAIT.observe(started_at - submitted_at)
+    try:
+        return func(*args)
+    finally:
+        PASSWORD_HASH_DURATION.labels(operation=operation).observe(
+            time.perf_counter() - started_at
+        )
+
+
+async def _run_in_hash_pool(operation: str, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a password hash operation in the bounded pool.
+
+    Args:
+        operation: Metric label ("hash" or "verify")
+        func: Blocking function to run
+        *args: Arguments for func
+
+    Returns:
+        Result of func
+
+    Raises:
+        HTTPException: 503 if the pool already has too much work admitted
+    """
+    global _password_hash_pending
+
+    if _password_hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        PASSWORD_HASH_REJECTED.labels(operation=operation).inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    _password_hash_pending += 1
+    PASSWORD_HASH_PENDING.inc()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            password_hash_executor,
+            _timed_hash_call, operation, time.perf_counter(), func, *args,
+        )
+    finally:
+        _password_hash_pending -= 1
+        PASSWORD_HASH_PENDING.dec()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password without blocking the event loop.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+
+    Returns:
+        True if password matches
+
+    Raises:
+        HTTPException: 503 if the hashing pool is saturated
+    """
+    return await _run_in_hash_pool("verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password without blocking the event loop.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password
+
+    Raises:
+        HTTPException: 503 if the hashing pool is saturated
+    """
+    return await _run_in_hash_pool("hash", get_password_hash, password)
+
+
 def create_access_token(
     data: dict[str, Any],
     expires_delta: Optional[timedelta] = None
@@ -67,7 +170,7 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "access"})
     encoded_jwt = jwt.encode(
         to_encode,
         settings.SECRET_KEY,
@@ -141,6 +244,13 @@ async def get_current_user_id(
         HTTPException: If token is invalid
     """
     token = credentials.credentials
+
+    # Hot path: token already verified by this process
+    cache_key = token_cache.key(token)
+    user_id = token_cache.get(cache_key)
+    if user_id is not None:
+        return user_id
+
     payload = decode_token(token)
 
     if payload.get("type") != "access":
@@ -149,11 +259,24 @@ async def get_current_user_id(
             detail="Invalid token type",
         )
 
-    user_id: Optional[int] = payload.get("sub")
-    if user_id is None:
+    subject: Optional[str] = payload.get("sub")
+    if subject is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
 
-    return int(user_id)
+    user_id = int(subject)
+    issued_at = payload.get("iat", 0)
+
+    if token_cache.is_revoked(cache_key, user_id, issued_at):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    token_cache.put(cache_key, user_id, payload.get("exp", 0), issued_at)
+
+    return user_id
+
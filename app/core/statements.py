@@ -0,0 +1,169 @@
+"""
+Prebuilt statements for hot queries.
+
+Building a select() with loader options and computing its cache key costs
+more per request than running the query against a warm connection.
+The statements here are lambda statements: SQLAlchemy analyses each lambda
+once per call site and caches the resulting construct, so later calls
+only pull the closure variables out as bound parameters and go straight
+to the compiled-statement cache (and from there to asyncpg's prepared
+statement cache).
+
+Lambdas must only close over plain values (ids, strings, datetimes);
+anything that changes the SQL shape is chosen with an if around a
+separate lambda, never inside one.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import func, lambda_stmt, literal_column, or_, select, tuple_
+from sqlalchemy.orm import contains_eager, selectinload
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from app.models.product import Product, ProductStatus
+from app.models.transaction import Message, Transaction, TransactionStatus
+
+
+def product_detail(product_id: int) -> StatementLambdaElement:
+    """Product with images and category."""
+    return lambda_stmt(
+        lambda: select(Product)
+        .options(selectinload(Product.images), selectinload(Product.category))
+        .where(Product.id == product_id)
+    )
+
+
+def product_by_id(product_id: int) -> StatementLambdaElement:
+    """Bare product row, for updates."""
+    return lambda_stmt(lambda: select(Product).where(Product.id == product_id))
+
+
+# The default listing filter is inlined as SQL rather than bound: the
+# partial indexes on available products (WHERE status = 'AVAILABLE') are
+# only usable if the planner sees the literal, and a generic plan for a
+# prepared statement never sees bound values.
+_IS_AVAILABLE = Product.status == literal_column(f"'{ProductStatus.AVAILABLE.name}'")
+
+
+def _filter_products(
+    stmt: StatementLambdaElement,
+    status: Optional[str],
+    category_id: Optional[int],
+    search: Optional[str],
+) -> StatementLambdaElement:
+    if status:
+        stmt += lambda s: s.where(Product.status == status)
+    else:
+        stmt += lambda s: s.where(_IS_AVAILABLE)
+
+    if category_id:
+        stmt += lambda s: s.where(Product.category_id == category_id)
+
+    if search:
+        pattern = f"%{search}%"
+        stmt += lambda s: s.where(
+            Product.title.ilike(pattern) | Product.description.ilike(pattern)
+        )
+
+    return stmt
+
+
+def product_count(
+    status: Optional[str],
+    category_id: Optional[int],
+    search: Optional[str],
+) -> StatementLambdaElement:
+    """Number of products matching the listing filters."""
+    stmt = lambda_stmt(lambda: select(func.count()).select_from(Product))
+    return _filter_products(stmt, status, category_id, search)
+
+
+def product_page(
+    status: Optional[str],
+    category_id: Optional[int],
+    search: Optional[str],
+    offset: int,
+    limit: int,
+) -> StatementLambdaElement:
+    """One page of products matching the listing filters, newest first."""
+    stmt = lambda_stmt(
+        lambda: select(Product).options(
+            selectinload(Product.images), selectinload(Product.category)
+        )
+    )
+    stmt = _filter_products(stmt, status, category_id, search)
+    stmt += lambda s: s.order_by(Product.created_at.desc()).offset(offset).limit(limit)
+    return stmt
+
+
+def product_owner_status(product_id: int) -> StatementLambdaElement:
+    """Seller and status of a product."""
+    return lambda_stmt(
+        lambda: select(Product.seller_id, Product.status).where(Product.id == product_id)
+    )
+
+
+def transaction_by_id(transaction_id: int) -> StatementLambdaElement:
+    """Single transaction."""
+    return lambda_stmt(
+        lambda: select(Transaction).where(Transaction.id == transaction_id)
+    )
+
+
+def transaction_history(
+    user_id: int,
+    as_seller: bool,
+    status: Optional[TransactionStatus],
+    cursor: Optional[tuple[datetime, int]],
+    limit: int,
+) -> StatementLambdaElement:
+    """
+    Keyset page of a user's purchases or sales with a product summary.
+
+    Args:
+        user_id: Buyer or seller
+        as_seller: List sales instead of purchases
+        status: Optional status filter
+        cursor: (created_at, id) of the last row of the previous page
+        limit: Rows to fetch
+
+    Returns:
+        Statement
+    """
+    stmt = lambda_stmt(
+        lambda: select(Transaction)
+        .join(Transaction.product)
+        .options(
+            contains_eager(Transaction.product).load_only(
+                Product.id, Product.title, Product.slug, Product.price, Product.status,
+            )
+        )
+    )
+
+    if as_seller:
+        stmt += lambda s: s.where(Transaction.seller_id == user_id)
+    else:
+        stmt += lambda s: s.where(Transaction.buyer_id == user_id)
+
+    if status:
+        stmt += lambda s: s.where(Transaction.status == status)
+
+    if cursor:
+        cursor_created_at, cursor_id = cursor
+        stmt += lambda s: s.where(
+            tuple_(Transaction.created_at, Transaction.id)
+            < tuple_(cursor_created_at, cursor_id)
+        )
+
+    stmt += lambda s: s.order_by(
+        Transaction.created_at.desc(), Transaction.id.desc()
+    ).limit(limit)
+    return stmt
+
+
+def user_messages(user_id: int) -> StatementLambdaElement:
+    """All messages sent or received by a user, newest first."""
+    return lambda_stmt(
+        lambda: select(Message)
+        .where(or_(Message.sender_id == user_id, Message.receiver_id == user_id))
+        .order_by(Message.created_at.desc())
+    )
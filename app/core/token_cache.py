@@ -0,0 +1,176 @@
+"""
+In-process cache of verified access tokens.
+
+Verifying a JWT means an HMAC check plus JSON parsing on every request.
+Once a token has been verified, its subject and expiry are remembered here
+so later requests with the same token cost a hash and a dictionary lookup.
+Entries are keyed by the SHA-256 of the token (raw bearer tokens are never
+held) and are dropped at the token's own expiry.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+from starlette.types import Scope
+
+from app.core.config import settings
+from app.core.metrics import TOKEN_CACHE_LOOKUPS, TOKEN_CACHE_EVICTIONS
+
+_hits = TOKEN_CACHE_LOOKUPS.labels(result="hit")
+_misses = TOKEN_CACHE_LOOKUPS.labels(result="miss")
+
+
+class VerifiedTokenCache:
+    """Bounded, expiry-aware LRU of verified token -> user id."""
+
+    def __init__(self, max_size: int = settings.TOKEN_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        # key -> (user_id, exp, iat)
+        self._entries: OrderedDict[bytes, tuple[int, float, float]] = OrderedDict()
+        # Revoked token key -> exp, kept until the token would have expired
+        self._revoked: dict[bytes, float] = {}
+        # user_id -> second before which issued tokens are rejected
+        self._subject_cutoffs: dict[int, int] = {}
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        """Cache key for a raw token."""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[int]:
+        """
+        Look up a verified token.
+
+        Args:
+            key: Token key from key()
+
+        Returns:
+            User ID, or None on a miss or if the token has expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            _misses.inc()
+            return None
+
+        if entry[1] <= time.time():
+            del self._entries[key]
+            TOKEN_CACHE_EVICTIONS.labels(reason="expired").inc()
+            _misses.inc()
+            return None
+
+        self._entries.move_to_end(key)
+        _hits.inc()
+        return entry[0]
+
+    def peek(self, key: bytes) -> Optional[int]:
+        """
+        Look up a verified token without touching LRU order or metrics.
+
+        Args:
+            key: Token key from key()
+
+        Returns:
+            User ID, or None if not cached or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def put(self, key: bytes, user_id: int, exp: float, iat: float = 0.0) -> None:
+        """
+        Remember a token that has just been verified.
+
+        Args:
+            key: Token key from key()
+            user_id: Token subject
+            exp: Token expiry (epoch seconds)
+            iat: Token issue time (epoch seconds)
+        """
+        if self.max_size <= 0 or self.is_revoked(key, user_id, iat):
+            return
+
+        self._entries[key] = (user_id, exp, iat)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            TOKEN_CACHE_EVICTIONS.labels(reason="capacity").inc()
+
+    def is_revoked(self, key: bytes, user_id: int, iat: float = 0.0) -> bool:
+        """Check whether a token was revoked on this process."""
+        if key in self._revoked:
+            return True
+        cutoff = self._subject_cutoffs.get(user_id)
+        return cutoff is not None and iat < cutoff
+
+    def revoke(self, token: str, exp: float) -> None:
+        """
+        Revoke a single token (e.g. on logout).
+
+        Args:
+            token: Raw token
+            exp: Token expiry (epoch seconds); the revocation is kept until then
+        """
+        key = self.key(token)
+        self._entries.pop(key, None)
+        self._revoked[key] = exp
+
+        now = time.time()
+        if len(self._revoked) > self.max_size:
+            self._revoked = {k: e for k, e in self._revoked.items() if e > now}
+
+    def revoke_subject(self, user_id: int) -> None:
+        """
+        Revoke every token issued to a user so far (e.g. password change).
+
+        Args:
+            user_id: Token subject
+        """
+        now = time.time()
+        # iat has whole-second resolution, so a token issued in the same
+        # second as the revocation (e.g. a fresh login right after it)
+        # must not compare as older
+        self._subject_cutoffs[user_id] = int(now)
+        for key in [k for k, entry in self._entries.items() if entry[0] == user_id]:
+            del self._entries[key]
+
+        # Cutoffs older than the access token lifetime can no longer match
+        horizon = now - settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        self._subject_cutoffs = {
+            uid: cutoff for uid, cutoff in self._subject_cutoffs.items()
+            if cutoff > horizon
+        }
+
+    def clear(self) -> None:
+        """Drop all cached tokens (revocations are kept)."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global verified-token cache
+token_cache = VerifiedTokenCache()
+
+
+def request_user_id(scope: Scope) -> Optional[int]:
+    """
+    User ID for a request whose bearer token this process already verified.
+
+    Only peeks at the cache, so it never pays for JWT verification and
+    leaves hit/miss metrics and LRU order to get_current_user_id; returns
+    None for anonymous or not-yet-verified tokens.
+
+    Args:
+        scope: ASGI scope of the request
+
+    Returns:
+        User ID or None
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token_cache.peek(token_cache.key(token))
+    return None
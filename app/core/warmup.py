@@ -0,0 +1,174 @@
+"""
+Startup warmup run before a pod reports ready.
+
+A new pod otherwise takes its first requests with empty connection pools,
+empty compiled-statement and prepared-statement caches, and no reference
+data, so every scale-out shows up as a latency spike. Warmup opens
+WARMUP_DB_CONNECTIONS connections on the primary and on each replica, runs
+the hot statements on every one of them (compiling each statement once
+and preparing it in each connection's asyncpg cache), opens
+WARMUP_REDIS_CONNECTIONS connections in each Redis pool (text and binary)
+and loads the category list. /health/ready reports unhealthy until it has
+finished.
+
+Warmup is best effort: failures are logged and the pod still becomes
+ready once it finishes or WARMUP_TIMEOUT passes; the readiness checks
+themselves catch a database or Redis that is really down.
+"""
+import asyncio
+import time
+from typing import Callable, Optional
+import structlog
+from redis import asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core import statements
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine, replica_set
+from app.core.metrics import WARMUP_DURATION
+from app.core.redis import redis_client
+from app.models.product import Category
+
+logger = structlog.get_logger()
+
+# Statements run on every warmed connection, with the parameters of the
+# most common request for each endpoint
+HOT_STATEMENTS: list[Callable] = [
+    lambda: statements.product_count(None, None, None),
+    lambda: statements.product_page(None, None, None, offset=0, limit=20),
+    lambda: statements.product_detail(0),
+    lambda: statements.product_owner_status(0),
+    lambda: statements.transaction_by_id(0),
+    lambda: statements.transaction_history(0, False, None, None, 21),
+    lambda: statements.transaction_history(0, True, None, None, 21),
+    lambda: statements.user_messages(0),
+]
+
+
+class ReferenceData:
+    """Small, rarely changing tables kept in process memory."""
+
+    def __init__(self):
+        self.categories: list[Category] = []
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def stale(self) -> bool:
+        return (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > settings.REFERENCE_DATA_TTL
+        )
+
+    async def load(self, session: AsyncSession) -> None:
+        """
+        Reload reference data.
+
+        Args:
+            session: Session to read with (a replica session is fine)
+        """
+        result = await session.execute(
+            select(Category)
+            .where(Category.is_active.is_(True))
+            .order_by(Category.order, Category.name)
+        )
+        self.categories = list(result.scalars().all())
+        self.loaded_at = time.monotonic()
+
+
+# Global reference data cache
+reference_data = ReferenceData()
+
+
+class Warmup:
+    """Runs the warmup steps once and records when they are done."""
+
+    def __init__(self):
+        self.ready = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def _warm_connection(self, target: AsyncEngine) -> None:
+        async with target.connect() as conn:
+            session = AsyncSession(bind=conn)
+            for build in HOT_STATEMENTS:
+                await session.execute(build())
+            await session.close()
+            await conn.rollback()
+
+    async def _warm_engine(self, name: str, target: AsyncEngine) -> None:
+        # Connections are held concurrently so the pool really grows to N
+        results = await asyncio.gather(
+            *(self._warm_connection(target) for _ in range(settings.WARMUP_DB_CONNECTIONS)),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            logger.warning("warmup_db_failed", pool=name, error=str(errors[0]))
+
+    async def _warm_redis(self) -> None:
+        # The text pool serves commands, the binary pool cached values
+        pools = [("text", redis_client.redis), ("binary", redis_client.binary)]
+        await asyncio.gather(*(
+            self._warm_redis_pool(name, pool) for name, pool in pools if pool
+        ))
+
+    async def _warm_redis_pool(self, name: str, pool: aioredis.Redis) -> None:
+        # Concurrent commands each check out their own pooled connection
+        results = await asyncio.gather(
+            *(pool.ping() for _ in range(settings.WARMUP_REDIS_CONNECTIONS)),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            logger.warning("warmup_redis_failed", pool=name, error=str(errors[0]))
+
+    async def _load_reference_data(self) -> None:
+        try:
+            async with AsyncSessionLocal() as session:
+                await reference_data.load(session)
+        except Exception as e:
+            logger.warning("warmup_reference_data_failed", error=str(e))
+
+    async def run(self) -> None:
+        """Run every warmup step, then mark the pod ready."""
+        started_at = time.perf_counter()
+        engines = [("primary", engine)] + [
+            (replica.name, replica.engine) for replica in replica_set.replicas
+        ]
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    *(self._warm_engine(name, target) for name, target in engines),
+                    self._warm_redis(),
+                    self._load_reference_data(),
+                ),
+                timeout=settings.WARMUP_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("warmup_timed_out", timeout=settings.WARMUP_TIMEOUT)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            WARMUP_DURATION.set(elapsed)
+            self.ready = True
+            logger.info("warmup_completed", duration_ms=round(elapsed * 1000, 1))
+
+    def start(self) -> None:
+        """Start warmup in the background, or mark ready if it is disabled."""
+        if not settings.WARMUP_ENABLED:
+            self.ready = True
+            return
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel warmup if it is still running."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+
+# Global warmup state
+warmup = Warmup()
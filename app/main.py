@@ -10,9 +10,13 @@ from fastapi.middleware.gzip import GZipMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core.database import check_schema_version, close_db, replica_set
 from app.core.redis import redis_client
-from app.api.endpoints import auth, products, transactions, messages, health
+from app.core.cache import cache
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.warmup import warmup
+from app.api.endpoints import auth, products, transactions, messages, reviews, health
 
 # Setup structured logging
 structlog.configure(
@@ -42,19 +46,29 @@ async def lifespan(app: FastAPI):
     logger.info("application_starting", environment=settings.ENVIRONMENT)
 
     try:
-        # Initialize database
-        await init_db()
-        logger.info("database_initialized")
+        # Schema is managed by Alembic; only check it is current
+        await check_schema_version()
+
+        # Start replica lag monitoring (no-op without replicas)
+        await replica_set.start()
 
         # Initialize Redis
         await redis_client.connect()
         logger.info("redis_connected")
 
+        # Listen for cache invalidations from other pods
+        await cache.start()
+
+        # Fill pools and caches in the background; /health/ready waits for it
+        warmup.start()
+
         yield
 
     finally:
         # Shutdown
         logger.info("application_shutting_down")
+        await warmup.stop()
+        await cache.stop()
         await redis_client.disconnect()
         await close_db()
         logger.info("cleanup_completed")
@@ -70,6 +84,13 @@ app = FastAPI(
     redoc_url="/redoc" if settings.DEBUG else None,
 )
 
+# Count SQL statements per request
+app.add_middleware(QueryStatsMiddleware)
+
+# Add rate limiting (inside CORS so 429 responses carry CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -155,6 +176,7 @@ app.include_router(auth.router, prefix=f"{settings.API_V1_PREFIX}/auth", tags=["
 app.include_router(products.router, prefix=f"{settings.API_V1_PREFIX}/products", tags=["Products"])
 app.include_router(transactions.router, prefix=f"{settings.API_V1_PREFIX}/transactions", tags=["Transactions"])
 app.include_router(messages.router, prefix=f"{settings.API_V1_PREFIX}/messages", tags=["Messages"])
+app.include_router(reviews.router, prefix=f"{settings.API_V1_PREFIX}/reviews", tags=["Reviews"])
 
 
 @app.get("/")
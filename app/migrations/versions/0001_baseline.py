@@ -0,0 +1,249 @@
+"""Baseline schema
+
+Schema as created by Base.metadata.create_all before the series that
+introduced migrations: no rating sums on users, no outbox_events table
+and no transaction/review history indexes (those come in 0002 and 0003).
+
+A database created by create_all from such a build should be stamped
+here and then upgraded, which adds and backfills everything since:
+
+    alembic -c app/alembic.ini stamp 0001_baseline
+    alembic -c app/alembic.ini upgrade head
+
+A database created by create_all from a later build already has the
+objects of 0002 and 0003; stamp 0003_transaction_history_outbox instead
+and upgrade from there (0004 only creates and drops indexes IF [NOT]
+EXISTS, so it is safe on a schema that already has some of them).
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ENUM_TYPES = ("userrole", "productcondition", "productstatus", "paymentmethod", "transactionstatus")
+
+
+def upgrade() -> None:
+    op.create_table('categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('slug', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('icon', sa.String(length=100), nullable=True),
+    sa.Column('order', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['parent_id'], ['categories.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_categories_id'), 'categories', ['id'], unique=False)
+    op.create_index(op.f('ix_categories_slug'), 'categories', ['slug'], unique=True)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=100), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('avatar_url', sa.String(length=500), nullable=True),
+    sa.Column('bio', sa.String(length=500), nullable=True),
+    sa.Column('location', sa.String(length=100), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('role', sa.Enum('ADMIN', 'USER', 'MODERATOR', name='userrole'), nullable=True),
+    sa.Column('rating', sa.Float(), nullable=True),
+    sa.Column('total_reviews', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('products',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('price', sa.Float(), nullable=False),
+    sa.Column('original_price', sa.Float(), nullable=True),
+    sa.Column('condition', sa.Enum('NEW', 'LIKE_NEW', 'GOOD', 'FAIR', 'POOR', name='productcondition'), nullable=True),
+    sa.Column('status', sa.Enum('AVAILABLE', 'RESERVED', 'SOLD', 'REMOVED', name='productstatus'), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('seller_id', sa.Integer(), nullable=False),
+    sa.Column('location', sa.String(length=200), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('views', sa.Integer(), nullable=True),
+    sa.Column('likes', sa.Integer(), nullable=True),
+    sa.Column('is_featured', sa.Boolean(), nullable=True),
+    sa.Column('is_negotiable', sa.Boolean(), nullable=True),
+    sa.Column('slug', sa.String(length=250), nullable=True),
+    sa.Column('meta_description', sa.String(length=300), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('sold_at', sa.DateTime(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_product_category_status', 'products', ['category_id', 'status'], unique=False)
+    op.create_index('idx_product_seller_status', 'products', ['seller_id', 'status'], unique=False)
+    op.create_index('idx_product_status_created', 'products', ['status', 'created_at'], unique=False)
+    op.create_index(op.f('ix_products_category_id'), 'products', ['category_id'], unique=False)
+    op.create_index(op.f('ix_products_created_at'), 'products', ['created_at'], unique=False)
+    op.create_index(op.f('ix_products_id'), 'products', ['id'], unique=False)
+    op.create_index(op.f('ix_products_seller_id'), 'products', ['seller_id'], unique=False)
+    op.create_index(op.f('ix_products_slug'), 'products', ['slug'], unique=True)
+    op.create_index(op.f('ix_products_status'), 'products', ['status'], unique=False)
+    op.create_index(op.f('ix_products_title'), 'products', ['title'], unique=False)
+    op.create_table('messages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sender_id', sa.Integer(), nullable=False),
+    sa.Column('receiver_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('attachment_url', sa.String(length=500), nullable=True),
+    sa.Column('attachment_type', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('read_at', sa.DateTime(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.CheckConstraint('sender_id != receiver_id', name='sender_receiver_different'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['receiver_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_messages_created_at'), 'messages', ['created_at'], unique=False)
+    op.create_index(op.f('ix_messages_id'), 'messages', ['id'], unique=False)
+    op.create_index(op.f('ix_messages_product_id'), 'messages', ['product_id'], unique=False)
+    op.create_index(op.f('ix_messages_receiver_id'), 'messages', ['receiver_id'], unique=False)
+    op.create_index(op.f('ix_messages_sender_id'), 'messages', ['sender_id'], unique=False)
+    op.create_table('product_images',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('thumbnail_url', sa.String(length=500), nullable=True),
+    sa.Column('order', sa.Integer(), nullable=True),
+    sa.Column('is_primary', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_images_id'), 'product_images', ['id'], unique=False)
+    op.create_index(op.f('ix_product_images_product_id'), 'product_images', ['product_id'], unique=False)
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('buyer_id', sa.Integer(), nullable=False),
+    sa.Column('seller_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('payment_method', sa.Enum('CASH', 'CARD', 'BANK_TRANSFER', 'MOBILE_PAYMENT', name='paymentmethod'), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'CONFIRMED', 'COMPLETED', 'CANCELLED', 'DISPUTED', name='transactionstatus'), nullable=True),
+    sa.Column('meeting_location', sa.String(length=300), nullable=True),
+    sa.Column('meeting_time', sa.DateTime(), nullable=True),
+    sa.Column('buyer_notes', sa.Text(), nullable=True),
+    sa.Column('seller_notes', sa.Text(), nullable=True),
+    sa.Column('cancellation_reason', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('cancelled_at', sa.DateTime(), nullable=True),
+    sa.CheckConstraint('amount > 0', name='amount_positive'),
+    sa.CheckConstraint('buyer_id != seller_id', name='buyer_seller_different'),
+    sa.ForeignKeyConstraint(['buyer_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transactions_buyer_id'), 'transactions', ['buyer_id'], unique=False)
+    op.create_index(op.f('ix_transactions_created_at'), 'transactions', ['created_at'], unique=False)
+    op.create_index(op.f('ix_transactions_id'), 'transactions', ['id'], unique=False)
+    op.create_index(op.f('ix_transactions_product_id'), 'transactions', ['product_id'], unique=False)
+    op.create_index(op.f('ix_transactions_seller_id'), 'transactions', ['seller_id'], unique=False)
+    op.create_index(op.f('ix_transactions_status'), 'transactions', ['status'], unique=False)
+    op.create_table('reviews',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=True),
+    sa.Column('reviewer_id', sa.Integer(), nullable=False),
+    sa.Column('reviewed_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('communication_rating', sa.Integer(), nullable=True),
+    sa.Column('punctuality_rating', sa.Integer(), nullable=True),
+    sa.Column('product_accuracy_rating', sa.Integer(), nullable=True),
+    sa.Column('is_visible', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.CheckConstraint('rating >= 1 AND rating <= 5', name='rating_range'),
+    sa.CheckConstraint('reviewer_id != reviewed_id', name='reviewer_reviewed_different'),
+    sa.ForeignKeyConstraint(['reviewed_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['reviewer_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reviews_created_at'), 'reviews', ['created_at'], unique=False)
+    op.create_index(op.f('ix_reviews_id'), 'reviews', ['id'], unique=False)
+    op.create_index(op.f('ix_reviews_reviewed_id'), 'reviews', ['reviewed_id'], unique=False)
+    op.create_index(op.f('ix_reviews_reviewer_id'), 'reviews', ['reviewer_id'], unique=False)
+    op.create_index(op.f('ix_reviews_transaction_id'), 'reviews', ['transaction_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reviews_transaction_id'), table_name='reviews')
+    op.drop_index(op.f('ix_reviews_reviewer_id'), table_name='reviews')
+    op.drop_index(op.f('ix_reviews_reviewed_id'), table_name='reviews')
+    op.drop_index(op.f('ix_reviews_id'), table_name='reviews')
+    op.drop_index(op.f('ix_reviews_created_at'), table_name='reviews')
+    op.drop_table('reviews')
+    op.drop_index(op.f('ix_transactions_status'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_seller_id'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_product_id'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_id'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_created_at'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_buyer_id'), table_name='transactions')
+    op.drop_table('transactions')
+    op.drop_index(op.f('ix_product_images_product_id'), table_name='product_images')
+    op.drop_index(op.f('ix_product_images_id'), table_name='product_images')
+    op.drop_table('product_images')
+    op.drop_index(op.f('ix_messages_sender_id'), table_name='messages')
+    op.drop_index(op.f('ix_messages_receiver_id'), table_name='messages')
+    op.drop_index(op.f('ix_messages_product_id'), table_name='messages')
+    op.drop_index(op.f('ix_messages_id'), table_name='messages')
+    op.drop_index(op.f('ix_messages_created_at'), table_name='messages')
+    op.drop_table('messages')
+    op.drop_index(op.f('ix_products_title'), table_name='products')
+    op.drop_index(op.f('ix_products_status'), table_name='products')
+    op.drop_index(op.f('ix_products_slug'), table_name='products')
+    op.drop_index(op.f('ix_products_seller_id'), table_name='products')
+    op.drop_index(op.f('ix_products_id'), table_name='products')
+    op.drop_index(op.f('ix_products_created_at'), table_name='products')
+    op.drop_index(op.f('ix_products_category_id'), table_name='products')
+    op.drop_index('idx_product_status_created', table_name='products')
+    op.drop_index('idx_product_seller_status', table_name='products')
+    op.drop_index('idx_product_category_status', table_name='products')
+    op.drop_table('products')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_categories_slug'), table_name='categories')
+    op.drop_index(op.f('ix_categories_id'), table_name='categories')
+    op.drop_table('categories')
+
+    for name in ENUM_TYPES:
+        sa.Enum(name=name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,66 @@
+"""Running rating sums on users
+
+Adds the per-user running sums that review creation maintains
+incrementally and backfills them from the visible reviews, the same
+computation as the reconciliation job (python -m app.services.ratings).
+The columns carry a constant DEFAULT 0, so adding them does not rewrite
+the users table. The review listing index is built CONCURRENTLY.
+
+Revision ID: 0002_user_rating_aggregates
+Revises: 0001_baseline
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_user_rating_aggregates"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+ASPECTS = ("communication_rating", "punctuality_rating", "product_accuracy_rating")
+COLUMNS = ["rating_sum"] + [f"{aspect}_{part}" for aspect in ASPECTS for part in ("sum", "count")]
+
+
+def upgrade() -> None:
+    for name in COLUMNS:
+        op.add_column(
+            "users",
+            sa.Column(name, sa.Integer(), server_default="0", nullable=False),
+        )
+
+    aspect_stats = ", ".join(
+        f"COALESCE(SUM({aspect}), 0) AS {aspect}_sum, COUNT({aspect}) AS {aspect}_count"
+        for aspect in ASPECTS
+    )
+    op.execute(f"""
+        UPDATE users SET
+            total_reviews = stats.total_reviews,
+            rating = stats.rating_sum::float / stats.total_reviews,
+            {", ".join(f"{name} = stats.{name}" for name in COLUMNS)}
+        FROM (
+            SELECT reviewed_id, COUNT(*) AS total_reviews, SUM(rating) AS rating_sum,
+                   {aspect_stats}
+            FROM reviews
+            WHERE is_visible IS TRUE
+            GROUP BY reviewed_id
+        ) AS stats
+        WHERE users.id = stats.reviewed_id
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_review_reviewed_created", "reviews", ["reviewed_id", "created_at", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_review_reviewed_created", table_name="reviews",
+            postgresql_concurrently=True, if_exists=True,
+        )
+    for name in reversed(COLUMNS):
+        op.drop_column("users", name)
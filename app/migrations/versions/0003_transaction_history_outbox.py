@@ -0,0 +1,59 @@
+"""Transaction history indexes and the outbox table
+
+Adds the covering indexes behind keyset pagination of purchase and sale
+history, built CONCURRENTLY, and the outbox_events table the outbox
+relay publishes from.
+
+Revision ID: 0003_transaction_history_outbox
+Revises: 0002_user_rating_aggregates
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_transaction_history_outbox"
+down_revision = "0002_user_rating_aggregates"
+branch_labels = None
+depends_on = None
+
+HISTORY_INDEXES = [
+    ("idx_transaction_buyer_created", ["buyer_id", "created_at", "id"]),
+    ("idx_transaction_seller_created", ["seller_id", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    op.create_table('outbox_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('aggregate_type', sa.String(length=50), nullable=False),
+    sa.Column('aggregate_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('published_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_outbox_published_at', 'outbox_events', ['published_at'], unique=False)
+    op.create_index('idx_outbox_unpublished', 'outbox_events', ['id'], unique=False, postgresql_where=sa.text('published_at IS NULL'))
+
+    with op.get_context().autocommit_block():
+        for name, columns in HISTORY_INDEXES:
+            op.create_index(
+                name, "transactions", columns,
+                postgresql_include=["status"],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in HISTORY_INDEXES:
+            op.drop_index(
+                name, table_name="transactions",
+                postgresql_concurrently=True, if_exists=True,
+            )
+
+    op.drop_index('idx_outbox_unpublished', table_name='outbox_events', postgresql_where=sa.text('published_at IS NULL'))
+    op.drop_index('idx_outbox_published_at', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -0,0 +1,72 @@
+"""Partial and composite indexes for hot query shapes
+
+Adds indexes matched to the predicates the API actually runs and drops
+single-column indexes that are now a prefix of a composite one. Every
+index is built and dropped CONCURRENTLY, so the migration can run
+against a live database without blocking writes. If a concurrent build
+is interrupted it leaves an INVALID index behind; drop it and re-run.
+
+Revision ID: 0004_hot_query_indexes
+Revises: 0003_transaction_history_outbox
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_hot_query_indexes"
+down_revision = "0003_transaction_history_outbox"
+branch_labels = None
+depends_on = None
+
+AVAILABLE = sa.text("status = 'AVAILABLE'")
+
+# (name, table, columns, extra create_index kwargs)
+NEW_INDEXES = [
+    ("idx_product_available_created", "products", ["created_at"],
+     {"postgresql_where": AVAILABLE}),
+    ("idx_product_available_category_created", "products", ["category_id", "created_at"],
+     {"postgresql_where": AVAILABLE}),
+    ("idx_message_sender_created", "messages", ["sender_id", "created_at"], {}),
+    ("idx_message_receiver_created", "messages", ["receiver_id", "created_at"], {}),
+]
+
+# Superseded by a composite index with the same leading column
+REDUNDANT_INDEXES = [
+    ("ix_products_status", "products", ["status"]),
+    ("ix_products_category_id", "products", ["category_id"]),
+    ("ix_products_seller_id", "products", ["seller_id"]),
+    ("ix_transactions_buyer_id", "transactions", ["buyer_id"]),
+    ("ix_transactions_seller_id", "transactions", ["seller_id"]),
+    ("ix_messages_sender_id", "messages", ["sender_id"]),
+    ("ix_messages_receiver_id", "messages", ["receiver_id"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Build replacements before dropping what they replace
+        for name, table, columns, kwargs in NEW_INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True, **kwargs,
+            )
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        for name, table, _, _ in NEW_INDEXES:
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
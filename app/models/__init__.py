@@ -2,6 +2,7 @@
 from app.models.user import User
 from app.models.product import Product, ProductImage, Category
 from app.models.transaction import Transaction, Message, Review
+from app.models.outbox import OutboxEvent
 
 __all__ = [
     "User",
@@ -11,4 +12,5 @@ __all__ = [
     "Transaction",
     "Message",
     "Review",
+    "OutboxEvent",
 ]
@@ -0,0 +1,37 @@
+"""Transactional outbox model."""
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, JSON, Index
+
+from app.core.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    Domain event written in the same transaction as the change it describes.
+
+    A relay worker publishes unpublished rows to Redis Streams in id order.
+    """
+
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, primary_key=True)
+    aggregate_type = Column(String(50), nullable=False)
+    aggregate_id = Column(Integer, nullable=False)
+    event_type = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    published_at = Column(DateTime)
+
+    # Only pending rows are indexed so the relay's poll stays cheap
+    __table_args__ = (
+        Index(
+            'idx_outbox_unpublished', 'id',
+            postgresql_where=published_at.is_(None),
+        ),
+        Index('idx_outbox_published_at', 'published_at'),
+    )
+
+    def __repr__(self):
+        return f"<OutboxEvent {self.event_type} {self.aggregate_type}:{self.aggregate_id}>"
@@ -2,7 +2,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, Text, Float, Boolean,
-    DateTime, ForeignKey, Enum as SQLEnum, Index
+    DateTime, ForeignKey, Enum as SQLEnum, Index, text
 )
 from sqlalchemy.orm import relationship
 import enum
@@ -66,9 +66,9 @@ class Product(Base):
 
     # Details
     condition = Column(SQLEnum(ProductCondition), default=ProductCondition.GOOD)
-    status = Column(SQLEnum(ProductStatus), default=ProductStatus.AVAILABLE, index=True)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
-    seller_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    status = Column(SQLEnum(ProductStatus), default=ProductStatus.AVAILABLE)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # Location
     location = Column(String(200))
@@ -97,11 +97,23 @@ class Product(Base):
     images = relationship("ProductImage", back_populates="product", cascade="all, delete-orphan")
     transactions = relationship("Transaction", back_populates="product")
 
-    # Indexes for common queries
+    # Indexes for common queries. The composite indexes also serve lookups
+    # on their leading column, so status/category_id/seller_id carry no
+    # single-column index of their own.
     __table_args__ = (
         Index('idx_product_status_created', 'status', 'created_at'),
         Index('idx_product_category_status', 'category_id', 'status'),
         Index('idx_product_seller_status', 'seller_id', 'status'),
+        # The default listing only ever shows available products; sold,
+        # reserved and removed (soft-deleted) rows are left out of these
+        Index(
+            'idx_product_available_created', 'created_at',
+            postgresql_where=text("status = 'AVAILABLE'"),
+        ),
+        Index(
+            'idx_product_available_category_created', 'category_id', 'created_at',
+            postgresql_where=text("status = 'AVAILABLE'"),
+        ),
     )
 
     def __repr__(self):
@@ -2,7 +2,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, Text, Float, Boolean,
-    DateTime, ForeignKey, Enum as SQLEnum, CheckConstraint
+    DateTime, ForeignKey, Enum as SQLEnum, CheckConstraint, Index
 )
 from sqlalchemy.orm import relationship
 import enum
@@ -34,8 +34,8 @@ class Transaction(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
-    buyer_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    seller_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    buyer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # Transaction details
     amount = Column(Float, nullable=False)
@@ -66,6 +66,17 @@ class Transaction(Base):
     __table_args__ = (
         CheckConstraint('buyer_id != seller_id', name='buyer_seller_different'),
         CheckConstraint('amount > 0', name='amount_positive'),
+        # Keyset pagination of purchase/sale history; status is carried in
+        # the index so status filters are applied before visiting the heap.
+        # These also serve plain buyer_id/seller_id lookups.
+        Index(
+            'idx_transaction_buyer_created', 'buyer_id', 'created_at', 'id',
+            postgresql_include=['status'],
+        ),
+        Index(
+            'idx_transaction_seller_created', 'seller_id', 'created_at', 'id',
+            postgresql_include=['status'],
+        ),
     )
 
     def __repr__(self):
@@ -78,8 +89,8 @@ class Message(Base):
     __tablename__ = "messages"
 
     id = Column(Integer, primary_key=True, index=True)
-    sender_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    receiver_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    sender_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    receiver_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), index=True)
 
     # Message content
@@ -102,6 +113,9 @@ class Message(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint('sender_id != receiver_id', name='sender_receiver_different'),
+        # Inbox listing: (sender_id = ? OR receiver_id = ?) ORDER BY created_at
+        Index('idx_message_sender_created', 'sender_id', 'created_at'),
+        Index('idx_message_receiver_created', 'receiver_id', 'created_at'),
     )
 
     def __repr__(self):
@@ -143,6 +157,7 @@ class Review(Base):
     __table_args__ = (
         CheckConstraint('rating >= 1 AND rating <= 5', name='rating_range'),
         CheckConstraint('reviewer_id != reviewed_id', name='reviewer_reviewed_different'),
+        Index('idx_review_reviewed_created', 'reviewed_id', 'created_at', 'id'),
     )
 
     def __repr__(self):
@@ -1,5 +1,6 @@
 """User model."""
 from datetime import datetime
+from typing import Optional
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 import enum
@@ -40,6 +41,15 @@ class User(Base):
     rating = Column(Float, default=0.0)
     total_reviews = Column(Integer, default=0)
 
+    # Running sums maintained incrementally on review creation
+    rating_sum = Column(Integer, default=0, server_default="0", nullable=False)
+    communication_rating_sum = Column(Integer, default=0, server_default="0", nullable=False)
+    communication_rating_count = Column(Integer, default=0, server_default="0", nullable=False)
+    punctuality_rating_sum = Column(Integer, default=0, server_default="0", nullable=False)
+    punctuality_rating_count = Column(Integer, default=0, server_default="0", nullable=False)
+    product_accuracy_rating_sum = Column(Integer, default=0, server_default="0", nullable=False)
+    product_accuracy_rating_count = Column(Integer, default=0, server_default="0", nullable=False)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -78,5 +88,26 @@ class User(Base):
         back_populates="reviewed"
     )
 
+    @property
+    def communication_rating(self) -> Optional[float]:
+        """Average communication rating."""
+        if not self.communication_rating_count:
+            return None
+        return self.communication_rating_sum / self.communication_rating_count
+
+    @property
+    def punctuality_rating(self) -> Optional[float]:
+        """Average punctuality rating."""
+        if not self.punctuality_rating_count:
+            return None
+        return self.punctuality_rating_sum / self.punctuality_rating_count
+
+    @property
+    def product_accuracy_rating(self) -> Optional[float]:
+        """Average product accuracy rating."""
+        if not self.product_accuracy_rating_count:
+            return None
+        return self.product_accuracy_rating_sum / self.product_accuracy_rating_count
+
     def __repr__(self):
         return f"<User {self.username}>"
@@ -1,6 +1,7 @@
 """Pydantic schemas for API validation."""
 from app.schemas.user import (
-    UserCreate, UserUpdate, UserResponse, UserLogin, Token
+    UserCreate, UserUpdate, UserResponse, UserLogin, Token,
+    RefreshRequest, UserRatingSummary
 )
 from app.schemas.product import (
     ProductCreate, ProductUpdate, ProductResponse, ProductList,
@@ -8,15 +9,18 @@ from app.schemas.product import (
 )
 from app.schemas.transaction import (
     TransactionCreate, TransactionUpdate, TransactionResponse,
+    TransactionHistoryItem, TransactionHistory,
     MessageCreate, MessageResponse,
-    ReviewCreate, ReviewResponse
+    ReviewCreate, ReviewResponse, ReviewList
 )
 
 __all__ = [
     "UserCreate", "UserUpdate", "UserResponse", "UserLogin", "Token",
+    "RefreshRequest", "UserRatingSummary",
     "ProductCreate", "ProductUpdate", "ProductResponse", "ProductList",
     "CategoryResponse",
     "TransactionCreate", "TransactionUpdate", "TransactionResponse",
+    "TransactionHistoryItem", "TransactionHistory",
     "MessageCreate", "MessageResponse",
-    "ReviewCreate", "ReviewResponse",
+    "ReviewCreate", "ReviewResponse", "ReviewList",
 ]
@@ -1,6 +1,6 @@
 """Transaction, Message, and Review schemas."""
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -43,6 +43,28 @@ class TransactionResponse(TransactionBase):
     completed_at: Optional[datetime] = None
 
 
+class TransactionProductSummary(BaseModel):
+    """Schema for the product summary embedded in transaction history."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    slug: Optional[str] = None
+    price: float
+    status: str
+
+
+class TransactionHistoryItem(TransactionResponse):
+    """Schema for a transaction history entry."""
+    product: TransactionProductSummary
+
+
+class TransactionHistory(BaseModel):
+    """Schema for a keyset-paginated transaction history page."""
+    items: List[TransactionHistoryItem]
+    next_cursor: Optional[str] = None
+
+
 # Message Schemas
 class MessageCreate(BaseModel):
     """Schema for creating a message."""
@@ -94,3 +116,9 @@ class ReviewResponse(BaseModel):
     product_accuracy_rating: Optional[int] = None
     is_visible: bool
     created_at: datetime
+
+
+class ReviewList(BaseModel):
+    """Schema for a keyset-paginated review list."""
+    items: List[ReviewResponse]
+    next_cursor: Optional[str] = None
@@ -43,6 +43,18 @@ class UserResponse(UserBase):
     last_login: Optional[datetime] = None
 
 
+class UserRatingSummary(BaseModel):
+    """Schema for a user's denormalized rating summary."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    rating: float
+    total_reviews: int
+    communication_rating: Optional[float] = None
+    punctuality_rating: Optional[float] = None
+    product_accuracy_rating: Optional[float] = None
+
+
 class UserLogin(BaseModel):
     """Schema for user login."""
     email: EmailStr
@@ -56,6 +68,11 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class RefreshRequest(BaseModel):
+    """Schema for refreshing or revoking a refresh token."""
+    refresh_token: str
+
+
 class TokenPayload(BaseModel):
     """Schema for token payload."""
     sub: int
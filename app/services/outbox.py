@@ -0,0 +1,267 @@
+"""
+Transactional outbox for domain events.
+
+Endpoints call record_event() before committing, so the event row commits
+or rolls back together with the change it describes. A single relay worker
+(leader-elected through a Postgres advisory lock) publishes pending events
+in id order to one Redis Stream per aggregate type, which preserves
+ordering per aggregate. Delivery is at-least-once; consumers should
+de-duplicate on the event_id field.
+
+The lock lives as long as the leader's database session. Before every
+batch the leader checks that its lock connection still answers, and goes
+back to the election if it has dropped, since Postgres will have
+released the lock and another relay may already lead. Only a batch in
+flight when the connection drops can overlap with the new leader.
+
+Run the relay with:
+    python -m app.services.outbox
+"""
+import asyncio
+import json
+import signal
+import time
+from datetime import datetime, timedelta
+from typing import Any
+import structlog
+from prometheus_client import start_http_server
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine, close_db
+from app.core.metrics import (
+    OUTBOX_EVENTS_PUBLISHED, OUTBOX_PUBLISH_ERRORS, OUTBOX_RELAY_LAG,
+    OUTBOX_PUBLISH_DELAY, OUTBOX_BATCH_SIZE,
+)
+from app.core.redis import redis_client
+from app.models.outbox import OutboxEvent
+
+logger = structlog.get_logger()
+
+# Advisory lock key held by the active relay
+RELAY_LOCK_KEY = 0x6F7574626F78
+
+# Seconds between leadership attempts for standby relays
+LEADER_RETRY_INTERVAL = 5.0
+
+# Seconds between purges of published events
+PURGE_INTERVAL = 60.0
+PURGE_BATCH_SIZE = 10_000
+
+
+def record_event(
+    db: AsyncSession,
+    aggregate_type: str,
+    aggregate_id: int,
+    event_type: str,
+    payload: dict[str, Any],
+) -> None:
+    """
+    Add a domain event to the current transaction.
+
+    Args:
+        db: Database session holding the change being described
+        aggregate_type: Aggregate name, e.g. "product"
+        aggregate_id: Aggregate primary key
+        event_type: Event name, e.g. "product.created"
+        payload: JSON-serializable event body
+    """
+    db.add(
+        OutboxEvent(
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            event_type=event_type,
+            payload=payload,
+        )
+    )
+
+
+def stream_name(aggregate_type: str) -> str:
+    """Redis Stream key for an aggregate type."""
+    return f"{settings.OUTBOX_STREAM_PREFIX}:{aggregate_type}"
+
+
+class OutboxRelay:
+    """Publishes committed outbox events to Redis Streams in batches."""
+
+    def __init__(
+        self,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._stopping = asyncio.Event()
+        self._last_purge = 0.0
+
+    def stop(self):
+        """Ask the relay to finish its current batch and exit."""
+        self._stopping.set()
+
+    async def run(self):
+        """Run until stopped, publishing while holding relay leadership."""
+        while not self._stopping.is_set():
+            try:
+                async with engine.connect() as lock_conn:
+                    # Autocommit so the lock holder never sits idle in transaction
+                    await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+                    acquired = await lock_conn.scalar(
+                        text("SELECT pg_try_advisory_lock(:key)"),
+                        {"key": RELAY_LOCK_KEY},
+                    )
+                    if not acquired:
+                        await self._sleep(LEADER_RETRY_INTERVAL)
+                        continue
+
+                    logger.info("outbox_relay_leader_acquired")
+                    try:
+                        await self._relay_loop(lock_conn)
+                    finally:
+                        await self._unlock(lock_conn)
+            except Exception as e:
+                # Lost the lock connection, or the database is unreachable
+                logger.error("outbox_relay_election_failed", error=str(e))
+                await self._sleep(LEADER_RETRY_INTERVAL)
+
+    async def _still_leader(self, lock_conn: AsyncConnection) -> bool:
+        # The lock belongs to the lock connection's session, so as long as
+        # that same connection answers, the lock is still ours
+        try:
+            await lock_conn.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning("outbox_relay_leader_lost", error=str(e))
+            return False
+        return True
+
+    async def _unlock(self, lock_conn: AsyncConnection):
+        if lock_conn.invalidated:
+            # The session is gone, and the lock went with it
+            return
+        await lock_conn.execute(
+            text("SELECT pg_advisory_unlock(:key)"),
+            {"key": RELAY_LOCK_KEY},
+        )
+
+    async def _relay_loop(self, lock_conn: AsyncConnection):
+        while not self._stopping.is_set():
+            if not await self._still_leader(lock_conn):
+                return
+
+            try:
+                published = await self.publish_batch()
+
+                if time.monotonic() - self._last_purge > PURGE_INTERVAL:
+                    await self.purge_published()
+                    self._last_purge = time.monotonic()
+            except Exception as e:
+                OUTBOX_PUBLISH_ERRORS.inc()
+                logger.error("outbox_relay_failed", error=str(e), exc_info=True)
+                await self._sleep(self.poll_interval)
+                continue
+
+            # Keep draining while batches come back full
+            if published < self.batch_size:
+                await self._sleep(self.poll_interval)
+
+    async def publish_batch(self) -> int:
+        """
+        Publish the next batch of pending events.
+
+        Returns:
+            Number of events published
+        """
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(OutboxEvent)
+                .where(OutboxEvent.published_at.is_(None))
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+            )
+            events = result.scalars().all()
+
+            if not events:
+                OUTBOX_RELAY_LAG.set(0)
+                return 0
+
+            now = datetime.utcnow()
+            OUTBOX_RELAY_LAG.set((now - events[0].created_at).total_seconds())
+
+            # One round trip for the whole batch; pipeline keeps id order
+            pipe = redis_client.redis.pipeline(transaction=False)
+            for event in events:
+                pipe.xadd(
+                    stream_name(event.aggregate_type),
+                    {
+                        "event_id": str(event.id),
+                        "event_type": event.event_type,
+                        "aggregate_type": event.aggregate_type,
+                        "aggregate_id": str(event.aggregate_id),
+                        "payload": json.dumps(event.payload),
+                        "created_at": event.created_at.isoformat(),
+                    },
+                    maxlen=settings.OUTBOX_STREAM_MAXLEN,
+                    approximate=True,
+                )
+            await pipe.execute()
+
+            await session.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_([event.id for event in events]))
+                .values(published_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+        OUTBOX_BATCH_SIZE.observe(len(events))
+        for event in events:
+            OUTBOX_EVENTS_PUBLISHED.labels(aggregate_type=event.aggregate_type).inc()
+            OUTBOX_PUBLISH_DELAY.observe((now - event.created_at).total_seconds())
+
+        return len(events)
+
+    async def purge_published(self) -> None:
+        """Delete published events older than the retention window."""
+        cutoff = datetime.utcnow() - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+        expired = (
+            select(OutboxEvent.id)
+            .where(OutboxEvent.published_at < cutoff)
+            .limit(PURGE_BATCH_SIZE)
+        )
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(OutboxEvent).where(OutboxEvent.id.in_(expired))
+            )
+            await session.commit()
+
+        if result.rowcount:
+            logger.info("outbox_purged", deleted=result.rowcount)
+
+    async def _sleep(self, seconds: float):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def main():
+    """Run the outbox relay until SIGINT/SIGTERM."""
+    start_http_server(settings.OUTBOX_METRICS_PORT)
+    await redis_client.connect()
+
+    relay = OutboxRelay()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, relay.stop)
+
+    logger.info("outbox_relay_starting", batch_size=relay.batch_size)
+    try:
+        await relay.run()
+    finally:
+        await redis_client.disconnect()
+        await close_db()
+        logger.info("outbox_relay_stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
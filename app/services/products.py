@@ -0,0 +1,37 @@
+"""
+Product listing cache generations.
+
+Listing pages are cached under keys that include the current listing
+generation. Anything that changes what a listing shows (creating,
+editing or removing a product, reserving it for a transaction) bumps the
+generation once it has committed, which makes every cached page
+unreachable at once instead of deleting keys by pattern. The old pages
+simply expire.
+
+The generation itself lives in the two-tier cache, so reading it is
+usually an L1 hit, and bumping it invalidates the other pods' copies.
+"""
+import uuid
+
+from app.core.cache import cache
+
+LISTING_GENERATION_KEY = "products:list:generation"
+
+# Must outlive any listing page; pages cached before the key expired were
+# keyed by an older generation and are gone by then
+LISTING_GENERATION_TTL = 24 * 3600
+
+
+async def listing_generation() -> str:
+    """
+    Current generation of the product listing cache.
+
+    Returns:
+        Opaque generation tag, "0" until the first write
+    """
+    return await cache.get(LISTING_GENERATION_KEY) or "0"
+
+
+async def invalidate_listings() -> None:
+    """Make every cached listing page stale; call after the write commits."""
+    await cache.set(LISTING_GENERATION_KEY, uuid.uuid4().hex[:12], LISTING_GENERATION_TTL)
@@ -0,0 +1,135 @@
+"""
+Seller rating aggregation.
+
+User rating columns are maintained incrementally from running sums when a
+review is created, so reading a rating never needs an aggregate query. A
+periodic reconciliation job recomputes the sums from the reviews table and
+repairs any drift (e.g. reviews hidden by moderation).
+
+Run reconciliation with:
+    python -m app.services.ratings
+"""
+import asyncio
+import structlog
+from sqlalchemy import Float, and_, cast, exists, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal, close_db
+from app.models.transaction import Review
+from app.models.user import User
+
+logger = structlog.get_logger()
+
+# Optional per-aspect ratings tracked as <aspect>_sum / <aspect>_count
+ASPECTS = ("communication_rating", "punctuality_rating", "product_accuracy_rating")
+
+
+async def apply_review(db: AsyncSession, review: Review) -> None:
+    """
+    Fold a new review into the reviewed user's running aggregates.
+
+    Executes a single UPDATE in the caller's transaction; the row lock taken
+    by the UPDATE serializes concurrent reviews for the same user.
+
+    Args:
+        db: Database session (same transaction as the review INSERT)
+        review: Newly created review
+    """
+    total_reviews = func.coalesce(User.total_reviews, 0)
+    values = {
+        "total_reviews": total_reviews + 1,
+        "rating_sum": User.rating_sum + review.rating,
+        "rating": cast(User.rating_sum + review.rating, Float) / (total_reviews + 1),
+    }
+
+    for aspect in ASPECTS:
+        score = getattr(review, aspect)
+        if score is not None:
+            values[f"{aspect}_sum"] = getattr(User, f"{aspect}_sum") + score
+            values[f"{aspect}_count"] = getattr(User, f"{aspect}_count") + 1
+
+    await db.execute(
+        update(User)
+        .where(User.id == review.reviewed_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_ratings(db: AsyncSession) -> int:
+    """
+    Recompute rating aggregates from visible reviews and fix drifted users.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of user rows corrected
+    """
+    columns = [
+        Review.reviewed_id.label("user_id"),
+        func.count().label("total_reviews"),
+        func.sum(Review.rating).label("rating_sum"),
+    ]
+    for aspect in ASPECTS:
+        review_column = getattr(Review, aspect)
+        columns.append(func.coalesce(func.sum(review_column), 0).label(f"{aspect}_sum"))
+        columns.append(func.count(review_column).label(f"{aspect}_count"))
+
+    stats = (
+        select(*columns)
+        .where(Review.is_visible.is_(True))
+        .group_by(Review.reviewed_id)
+        .subquery()
+    )
+
+    tracked = ["total_reviews", "rating_sum"]
+    for aspect in ASPECTS:
+        tracked += [f"{aspect}_sum", f"{aspect}_count"]
+
+    # Users whose stored aggregates disagree with their reviews
+    drifted = await db.execute(
+        update(User)
+        .where(
+            User.id == stats.c.user_id,
+            or_(*[
+                getattr(User, name).is_distinct_from(stats.c[name])
+                for name in tracked
+            ]),
+        )
+        .values(
+            rating=cast(stats.c.rating_sum, Float) / stats.c.total_reviews,
+            **{name: stats.c[name] for name in tracked},
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    # Users that still carry aggregates but have no visible reviews left
+    emptied = await db.execute(
+        update(User)
+        .where(
+            User.total_reviews != 0,
+            ~exists().where(
+                and_(Review.reviewed_id == User.id, Review.is_visible.is_(True))
+            ),
+        )
+        .values(rating=0.0, **{name: 0 for name in tracked})
+        .execution_options(synchronize_session=False)
+    )
+
+    return drifted.rowcount + emptied.rowcount
+
+
+async def main():
+    """Run a single reconciliation pass."""
+    try:
+        async with AsyncSessionLocal() as session:
+            corrected = await reconcile_ratings(session)
+            await session.commit()
+        logger.info("ratings_reconciled", corrected_users=corrected)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+User account services.
+
+Uniqueness of email and username is enforced by the unique indexes on the
+users table rather than by SELECT-before-INSERT; callers catch the
+IntegrityError and use unique_violation_column() to report which field
+collided.
+"""
+from datetime import datetime
+from typing import Any, Iterable, Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+
+# Unique indexes created by `unique=True, index=True` on User columns
+UNIQUE_INDEX_COLUMNS = {
+    "ix_users_email": "email",
+    "ix_users_username": "username",
+}
+
+# Columns accepted by import_users
+IMPORT_COLUMNS = (
+    "email", "username", "hashed_password", "full_name", "phone",
+    "bio", "location", "avatar_url", "is_active", "is_verified", "created_at",
+)
+
+
+def unique_violation_column(exc: IntegrityError) -> Optional[str]:
+    """
+    Work out which unique column an INSERT collided on.
+
+    Args:
+        exc: IntegrityError raised by the INSERT
+
+    Returns:
+        "email", "username", or None for any other integrity error
+    """
+    # asyncpg's UniqueViolationError is chained behind the DBAPI adapter
+    driver_error = getattr(exc.orig, "__cause__", None)
+    constraint = getattr(driver_error, "constraint_name", None)
+    if constraint in UNIQUE_INDEX_COLUMNS:
+        return UNIQUE_INDEX_COLUMNS[constraint]
+
+    message = str(exc.orig)
+    for index_name, column in UNIQUE_INDEX_COLUMNS.items():
+        if index_name in message:
+            return column
+    return None
+
+
+async def import_users(
+    db: AsyncSession,
+    users: Iterable[dict[str, Any]],
+    batch_size: int = 1000,
+) -> tuple[int, int]:
+    """
+    Bulk-insert pre-hashed user records, skipping ones that already exist.
+
+    Each batch is a single multi-row INSERT ... ON CONFLICT DO NOTHING, so
+    re-running an import is safe. Passwords must already be bcrypt hashes
+    (hashing millions of passwords here would take hours).
+
+    Args:
+        db: Database session; the caller commits
+        users: Records with IMPORT_COLUMNS keys (email, username and
+            hashed_password are required)
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        Tuple of (inserted, skipped)
+    """
+    inserted = skipped = 0
+    batch: list[dict[str, Any]] = []
+
+    async def flush_batch():
+        nonlocal inserted, skipped
+        result = await db.execute(
+            insert(User)
+            .values(batch)
+            .on_conflict_do_nothing()
+            .returning(User.id)
+        )
+        created = len(result.all())
+        inserted += created
+        skipped += len(batch) - created
+        batch.clear()
+
+    for record in users:
+        # Multi-row VALUES needs the same keys on every row
+        row = {column: record.get(column) for column in IMPORT_COLUMNS}
+        if row["is_active"] is None:
+            row["is_active"] = True
+        if row["is_verified"] is None:
+            row["is_verified"] = False
+        if row["created_at"] is None:
+            row["created_at"] = datetime.utcnow()
+        batch.append(row)
+        if len(batch) >= batch_size:
+            await flush_batch()
+
+    if batch:
+        await flush_batch()
+
+    return inserted, skipped
@@ -0,0 +1,100 @@
+"""
+Benchmark: size and speed of each cached value codec and compression.
+
+Encodes product list pages shaped like the cached list_products
+response (20 and 100 items) with every codec/compression pair in
+app/core/codecs.py and reports the stored size (what the value costs in
+Redis, plus ~50 bytes of per-key overhead) and the encode and decode
+times. No Redis is needed.
+
+Usage:
+    python scripts/bench_codecs.py [--iterations 2000] [--min-compress-bytes 1024]
+"""
+import argparse
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.codecs import COMPRESSORS, SERIALIZERS, ValueCodec
+
+WORDS = (
+    "vintage camera lens leather bag bicycle wooden desk lamp ceramic vase "
+    "mechanical keyboard wireless headphones hiking boots espresso machine "
+    "gently used like new original box receipt included pickup only"
+).split()
+
+
+def product(i: int, rng: random.Random) -> dict:
+    created_at = datetime(2024, 1, 1) + timedelta(minutes=rng.randrange(500_000))
+    title = " ".join(rng.choices(WORDS, k=4)).title()
+    return {
+        "id": i,
+        "title": title,
+        "slug": f"{title.lower().replace(' ', '-')}-{i}",
+        "description": " ".join(rng.choices(WORDS, k=40)),
+        "price": rng.randrange(1_000, 2_000_000, 100),
+        "original_price": None,
+        "condition": rng.choice(["new", "like_new", "good", "fair"]),
+        "status": "available",
+        "is_negotiable": rng.random() < 0.5,
+        "location": rng.choice(["Seoul", "Busan", "Incheon", "Daegu"]),
+        "views": rng.randrange(5_000),
+        "likes": rng.randrange(300),
+        "seller_id": rng.randrange(1, 10_000),
+        "category_id": rng.randrange(1, 11),
+        "category": {"id": 3, "name": "Electronics", "slug": "electronics", "description": None, "icon": None},
+        "images": [
+            {"id": i * 10 + n, "image_url": f"/media/products/{i}/{n}.jpg", "thumbnail_url": None, "order": n}
+            for n in range(rng.randrange(1, 5))
+        ],
+        "created_at": created_at.isoformat(),
+        "updated_at": created_at.isoformat(),
+    }
+
+
+def page(size: int) -> dict:
+    rng = random.Random(size)
+    return {
+        "items": [product(i, rng) for i in range(size)],
+        "total": 48_213,
+        "page": 1,
+        "page_size": size,
+        "pages": 48_213 // size + 1,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cached value codecs")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--min-compress-bytes", type=int, default=1024)
+    args = parser.parse_args()
+
+    for size in (20, 100):
+        value = page(size)
+        print(f"\nproduct page, {size} items")
+        print(f"{'codec':<10}{'compression':<13}{'bytes':>9}{'encode':>11}{'decode':>11}")
+        for codec_name in SERIALIZERS:
+            for compression in COMPRESSORS:
+                try:
+                    codec = ValueCodec(codec_name, compression, args.min_compress_bytes)
+                    data = codec.encode(value)
+                except ImportError as e:
+                    print(f"{codec_name:<10}{compression:<13}  unavailable ({e.name})")
+                    continue
+                assert codec.decode(data) == value
+                encode_us = timeit.timeit(lambda: codec.encode(value), number=args.iterations)
+                decode_us = timeit.timeit(lambda: codec.decode(data), number=args.iterations)
+                print(
+                    f"{codec_name:<10}{compression:<13}{len(data):>9,}"
+                    f"{encode_us / args.iterations * 1e6:>9.1f}us"
+                    f"{decode_us / args.iterations * 1e6:>9.1f}us"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: per-key Redis calls vs. the batched RedisClient operations.
+
+Hydrates a page of cached values (default 50, the size of a product page
+with some headroom) one key at a time, with mget/mset and with a
+pipeline, and reports the round trips each approach makes (counted as
+packets written to the socket) and the wall time. Needs the Redis from
+the environment's settings; keys are written under bench:batch: and
+deleted afterwards.
+
+Usage:
+    python scripts/bench_redis_batch.py [--keys 50] [--repeat 20]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from redis import asyncio as aioredis
+from redis.asyncio.connection import Connection
+
+from app.core.config import settings
+from app.core.redis import RedisClient
+
+PREFIX = "bench:batch:"
+
+
+class CountingConnection(Connection):
+    """Connection that counts the packets it sends (one per round trip)."""
+
+    sent = 0
+
+    async def send_packed_command(self, command, check_health=True):
+        CountingConnection.sent += 1
+        await super().send_packed_command(command, check_health)
+
+
+def payload(i: int) -> dict:
+    return {"id": i, "title": f"Product {i}", "price": 10000 + i, "images": [f"/img/{i}.jpg"]}
+
+
+async def one_by_one(client: RedisClient, keys: list[str]) -> None:
+    for i, key in enumerate(keys):
+        await client.set(key, payload(i), expire=60)
+    for key in keys:
+        await client.get(key)
+    for key in keys:
+        await client.incr(f"{key}:views")
+        await client.expire(f"{key}:views", 60)
+
+
+async def batched(client: RedisClient, keys: list[str]) -> None:
+    await client.mset({key: payload(i) for i, key in enumerate(keys)}, expire=60)
+    await client.mget(keys)
+    await client.incr_many({f"{key}:views": 1 for key in keys}, expire=60)
+
+
+async def pipelined(client: RedisClient, keys: list[str]) -> None:
+    async with client.pipeline() as batch:
+        for i, key in enumerate(keys):
+            batch.set(key, payload(i), expire=60)
+            batch.get(key)
+            batch.incr(f"{key}:views").expire(f"{key}:views", 60)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare per-key and batched Redis calls")
+    parser.add_argument("--keys", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    client = RedisClient()
+    client.redis = aioredis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        connection_class=CountingConnection,
+    )
+    keys = [f"{PREFIX}{i}" for i in range(args.keys)]
+
+    try:
+        await client.redis.ping()
+        print(f"{'approach':<14}{'round trips':>13}{'mean time':>12}")
+        for name, run in [("one by one", one_by_one), ("mget/mset", batched), ("pipeline", pipelined)]:
+            await run(client, keys)  # warm the connection pool
+            CountingConnection.sent = 0
+            started_at = time.perf_counter()
+            for _ in range(args.repeat):
+                await run(client, keys)
+            elapsed = (time.perf_counter() - started_at) / args.repeat
+            print(f"{name:<14}{CountingConnection.sent // args.repeat:>13}{elapsed * 1000:>10.2f}ms")
+    finally:
+        await client.redis.delete(*keys, *(f"{key}:views" for key in keys))
+        await client.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Startup-time benchmark for the API process.
+
+Measures, in fresh interpreters, how long `import app.main` takes and
+(optionally) how long the lifespan startup takes, i.e. everything a new
+pod does before it can serve traffic. Fails when the median exceeds
+--budget-ms so the number can be held in CI.
+
+Usage:
+    python scripts/bench_startup.py [--runs 10] [--lifespan] [--budget-ms 1500]
+    python scripts/bench_startup.py --importtime 15   # slowest imports
+
+--lifespan needs the database and Redis from the environment's settings.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Runs in the child; prints one JSON line of phase timings in seconds
+PROBE = """
+import asyncio, json, time
+started_at = time.perf_counter()
+from app.main import app
+imported_at = time.perf_counter()
+timings = {"import": imported_at - started_at}
+
+if LIFESPAN:
+    async def startup():
+        async with app.router.lifespan_context(app):
+            timings["lifespan"] = time.perf_counter() - imported_at
+    asyncio.run(startup())
+
+print(json.dumps(timings))
+"""
+
+
+def run_probe(lifespan: bool) -> dict[str, float]:
+    result = subprocess.run(
+        [sys.executable, "-c", f"LIFESPAN = {lifespan}\n{PROBE}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def show_importtime(top: int) -> None:
+    """Print the slowest imports by cumulative time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            rows.append((int(cumulative_us), int(self_us), module.strip()))
+    rows.sort(reverse=True)
+    print(f"{'cumulative':>12}{'self':>10}  module")
+    for cumulative_us, self_us, module in rows[:top]:
+        print(f"{cumulative_us / 1000:>10.1f}ms{self_us / 1000:>8.1f}ms  {module}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark API import and startup time")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--lifespan", action="store_true", help="also time lifespan startup")
+    parser.add_argument("--budget-ms", type=float, help="fail if the median total exceeds this")
+    parser.add_argument("--importtime", type=int, metavar="N", help="show the N slowest imports and exit")
+    args = parser.parse_args()
+
+    if args.importtime:
+        show_importtime(args.importtime)
+        return 0
+
+    # One untimed run so .pyc files exist, as they do in the image
+    run_probe(False)
+
+    samples = [run_probe(args.lifespan) for _ in range(args.runs)]
+    phases = list(samples[0])
+    totals = [sum(sample.values()) for sample in samples]
+
+    print(f"{'phase':<10}{'median':>10}{'p95':>10}{'max':>10}")
+    for phase, values in [(p, [s[p] for s in samples]) for p in phases] + [("total", totals)]:
+        ordered = sorted(values)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(f"{phase:<10}{statistics.median(values) * 1000:>8.0f}ms"
+              f"{p95 * 1000:>8.0f}ms{max(values) * 1000:>8.0f}ms")
+
+    median_ms = statistics.median(totals) * 1000
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        print(f"✗ median startup {median_ms:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Product view counter check.
+
+Runs the app in-process with read replicas off, so product detail reads
+and the view counter UPDATE share one session on the primary. Fetches a
+product twice and fails if the view count in a response differs from the
+one stored in the database (e.g. the UPDATE also synchronizing the loaded
+product, on top of the handler's own increment).
+
+Needs a migrated database with the initial categories
+(scripts/init_db.py); Redis is optional. Creates a throwaway user and
+product.
+
+Usage:
+    python scripts/check_product_views.py
+
+Exits non-zero if a returned count does not match the stored one.
+"""
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Must be set before the settings are loaded
+os.environ["DATABASE_REPLICA_URLS"] = "[]"
+
+import httpx
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.main import app
+from app.models.product import Product
+
+API = settings.API_V1_PREFIX
+
+
+async def create_product(client: httpx.AsyncClient) -> int:
+    """Register a throwaway seller and list one product."""
+    email = f"views-{uuid.uuid4().hex[:8]}@example.com"
+    password = "views-check-1"
+    response = await client.post(f"{API}/auth/register", json={
+        "email": email, "username": email.split("@")[0], "password": password,
+    })
+    response.raise_for_status()
+    response = await client.post(f"{API}/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    categories = (await client.get(f"{API}/products/categories")).json()
+    response = await client.post(f"{API}/products/", headers=headers, json={
+        "title": "View counter check item",
+        "description": "Created by scripts/check_product_views.py",
+        "price": 10000,
+        "condition": "good",
+        "category_id": categories[0]["id"],
+    })
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+async def stored_views(product_id: int) -> int:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Product.views).where(Product.id == product_id))
+        return result.scalar_one()
+
+
+async def main() -> int:
+    transport = httpx.ASGITransport(app=app)
+    failures = 0
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://views-check") as client:
+            product_id = await create_product(client)
+
+            for attempt in (1, 2):
+                response = await client.get(f"{API}/products/{product_id}")
+                response.raise_for_status()
+                returned = response.json()["views"]
+                stored = await stored_views(product_id)
+                if returned == stored == attempt:
+                    print(f"✓ GET #{attempt}: {returned} views")
+                else:
+                    failures += 1
+                    print(f"✗ GET #{attempt}: returned {returned}, stored {stored}, expected {attempt}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
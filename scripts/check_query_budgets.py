@@ -0,0 +1,146 @@
+"""
+Query budget check for the API routes.
+
+Runs the app in-process with QUERY_BUDGET_ENFORCE on and calls every
+route that declares a query_budget(), so a route that runs more SQL
+statements than its budget (typically an N+1 from a new relationship
+access) fails the run instead of only logging a warning. Fails as well
+if a budgeted route is not exercised here, so new routes have to be
+added to CHECKS.
+
+Needs a migrated database with the initial categories
+(scripts/init_db.py); Redis is optional. Creates two throwaway users, a
+product and a transaction.
+
+Usage:
+    python scripts/check_query_budgets.py
+
+Exits non-zero if any route failed or went over budget.
+"""
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Must be set before the settings are loaded
+os.environ["QUERY_BUDGET_ENFORCE"] = "true"
+
+import httpx
+
+from app.core.config import settings
+from app.core.query_stats import QueryBudgetExceeded
+from app.main import app
+
+API = settings.API_V1_PREFIX
+
+# (method, route path, calling user, request body); path parameters and
+# bodies are filled in from the fixtures created below
+CHECKS = [
+    ("GET", f"{API}/products/", None, None),
+    ("GET", f"{API}/products/categories", None, None),
+    ("GET", f"{API}/products/{{product_id}}", None, None),
+    ("POST", f"{API}/transactions/", "buyer", "transaction"),
+    ("GET", f"{API}/transactions/", "buyer", None),
+    ("GET", f"{API}/transactions/{{transaction_id}}", "seller", None),
+    ("GET", f"{API}/messages/", "buyer", None),
+    ("GET", f"{API}/reviews/users/{{user_id}}", None, None),
+    ("GET", f"{API}/reviews/users/{{user_id}}/summary", None, None),
+]
+
+
+def budgeted_routes() -> set[tuple[str, str]]:
+    """(method, path) of every route with a query_budget() dependency."""
+    routes = set()
+    for route in app.routes:
+        dependencies = getattr(route, "dependant", None)
+        if dependencies is None:
+            continue
+        if any(d.call.__qualname__.startswith("query_budget.") for d in dependencies.dependencies):
+            routes.update((method, route.path) for method in route.methods)
+    return routes
+
+
+async def signup(client: httpx.AsyncClient, name: str) -> dict:
+    """Register and log in a throwaway user."""
+    email = f"budget-{name}-{uuid.uuid4().hex[:8]}@example.com"
+    password = "budget-check-1"
+    response = await client.post(f"{API}/auth/register", json={
+        "email": email, "username": email.split("@")[0], "password": password,
+    })
+    response.raise_for_status()
+    user = response.json()
+    response = await client.post(f"{API}/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    user["headers"] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return user
+
+
+async def main() -> int:
+    transport = httpx.ASGITransport(app=app)
+    failures = 0
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://budget-check") as client:
+            categories = (await client.get(f"{API}/products/categories")).json()
+            if not categories:
+                print("✗ no categories; run scripts/init_db.py first")
+                return 1
+
+            seller = await signup(client, "seller")
+            buyer = await signup(client, "buyer")
+            response = await client.post(f"{API}/products/", headers=seller["headers"], json={
+                "title": "Query budget check item",
+                "description": "Created by scripts/check_query_budgets.py",
+                "price": 10000,
+                "condition": "good",
+                "category_id": categories[0]["id"],
+            })
+            response.raise_for_status()
+            product = response.json()
+
+            users = {"buyer": buyer, "seller": seller}
+            params = {"product_id": product["id"], "user_id": seller["id"]}
+            bodies = {"transaction": {"product_id": product["id"], "amount": product["price"]}}
+
+            for method, route, caller, body in CHECKS:
+                try:
+                    url = route.format(**params)
+                except KeyError as e:
+                    failures += 1
+                    print(f"✗ {method} {route}: skipped, no {e.args[0]} (an earlier check failed)")
+                    continue
+                headers = users[caller]["headers"] if caller else {}
+                try:
+                    response = await client.request(
+                        method, url, headers=headers, json=bodies.get(body),
+                    )
+                except QueryBudgetExceeded as e:
+                    failures += 1
+                    print(f"✗ {method} {route}: {e}")
+                    continue
+
+                if response.is_success:
+                    print(f"✓ {method} {route}")
+                else:
+                    failures += 1
+                    print(f"✗ {method} {route}: HTTP {response.status_code} {response.text[:200]}")
+
+                if body == "transaction" and response.is_success:
+                    params["transaction_id"] = response.json()["id"]
+
+    unchecked = budgeted_routes() - {(method, route) for method, route, _, _ in CHECKS}
+    for method, route in sorted(unchecked):
+        failures += 1
+        print(f"✗ {method} {route}: has a query budget but is not checked here")
+
+    checked = len(CHECKS) + len(unchecked)
+    print(f"{checked - failures}/{checked} routes within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,153 @@
+"""
+Query plan regression check for the hot queries.
+
+Runs EXPLAIN on every statement in app/core/statements.py that the API
+serves on hot paths and fails if any of them reads one of the big tables
+with a sequential scan. By default sequential scans are discouraged
+(enable_seqscan = off), so a Seq Scan in the plan means no usable index
+exists at all and the check works on a small dataset too; with
+--realistic the planner's own choice is checked, which needs a database
+seeded at production scale (see scripts/init_db.py).
+
+Statements are compiled for asyncpg and planned as prepared statements
+with plan_cache_mode = force_generic_plan, i.e. without looking at the
+bound values, which is the plan the API ends up running once Postgres
+switches a hot prepared statement to its generic plan.
+
+Usage:
+    python scripts/check_query_plans.py [--realistic] [--verbose]
+
+Exits non-zero if any plan regressed.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, text
+
+from app.core import statements
+from app.core.database import engine
+from app.models import ProductImage, Category, User
+
+# Tables that must never be read with a sequential scan on a hot path
+LARGE_TABLES = {"users", "products", "product_images", "transactions", "messages", "reviews"}
+
+CURSOR = (datetime(2024, 1, 1), 1_000_000)
+
+CASES = [
+    ("product list (default)", statements.product_page(None, None, None, offset=0, limit=20)),
+    ("product list (deep page)", statements.product_page(None, None, None, offset=2000, limit=20)),
+    ("product list (category)", statements.product_page(None, 3, None, offset=0, limit=20)),
+    ("product count (category)", statements.product_count(None, 3, None)),
+    ("product detail", statements.product_detail(1)),
+    ("product images (selectin)", select(ProductImage).where(ProductImage.product_id.in_([1, 2, 3]))),
+    ("product categories (selectin)", select(Category).where(Category.id.in_([1, 2, 3]))),
+    ("purchases", statements.transaction_history(1, False, None, None, 21)),
+    ("sales (next page)", statements.transaction_history(1, True, None, CURSOR, 21)),
+    ("transaction detail", statements.transaction_by_id(1)),
+    ("messages", statements.user_messages(1)),
+    ("user by email", select(User).where(User.email == "demo@multiweb.com")),
+]
+
+
+def prepare(statement) -> tuple[str, list[str]]:
+    """
+    Compile a statement the way the API sends it.
+
+    Returns:
+        SQL with $n placeholders as asyncpg prepares it, and the bound
+        values as SQL literals in placeholder order
+    """
+    compiled = statement.compile(
+        dialect=engine.dialect,
+        compile_kwargs={"render_postcompile": True},
+    )
+    params = compiled.params
+    literals = []
+    for name in compiled.positiontup:
+        value = params[name]
+        if value is None:
+            literals.append("NULL")
+        else:
+            # IN lists are expanded to <name>_1, <name>_2, ...
+            bind = compiled.binds.get(name)
+            if bind is None:
+                bind = compiled.binds[name.rsplit("_", 1)[0]]
+            literals.append(bind.type.literal_processor(engine.dialect)(value))
+    return str(compiled), literals
+
+
+def walk(plan: dict):
+    """Yield every node of a JSON plan."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+async def explain(driver, sql: str, literals: list[str]) -> dict:
+    """
+    EXPLAIN a statement as a server-side prepared statement.
+
+    asyncpg prepares every statement, and after a few executions Postgres
+    may switch to a generic plan that cannot see the bound values. The
+    caller forces that plan, so an index that is only usable for
+    particular values (e.g. a partial index matched by a bound status)
+    does not pass the check.
+    """
+    await driver.execute(f"PREPARE hot_query AS {sql}")
+    try:
+        args = f"({', '.join(literals)})" if literals else ""
+        raw = await driver.fetchval(f"EXPLAIN (FORMAT JSON) EXECUTE hot_query{args}")
+    finally:
+        await driver.execute("DEALLOCATE hot_query")
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Check hot query plans for sequential scans")
+    parser.add_argument("--realistic", action="store_true",
+                        help="keep sequential scans enabled (needs a production-scale dataset)")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    failures = 0
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("ANALYZE"))
+            await conn.execute(text("SET plan_cache_mode = force_generic_plan"))
+            if not args.realistic:
+                await conn.execute(text("SET enable_seqscan = off"))
+            driver = (await conn.get_raw_connection()).driver_connection
+
+            for name, statement in CASES:
+                plan = await explain(driver, *prepare(statement))
+                nodes = list(walk(plan))
+                seq_scans = sorted({
+                    node["Relation Name"] for node in nodes
+                    if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in LARGE_TABLES
+                })
+                indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+
+                if seq_scans:
+                    failures += 1
+                    print(f"✗ {name}: sequential scan on {', '.join(seq_scans)}")
+                else:
+                    print(f"✓ {name}: {', '.join(indexes) or 'no index needed'}")
+
+                if args.verbose or seq_scans:
+                    print(json.dumps(plan, indent=2))
+    finally:
+        await engine.dispose()
+
+    print(f"{len(CASES) - failures}/{len(CASES)} plans OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,74 @@
+"""
+Bulk user import for account migrations.
+Reads JSON Lines (one user object per line) with pre-hashed passwords and
+inserts them in batches; existing emails/usernames are skipped, so the
+import can be re-run safely.
+
+Usage:
+    python scripts/import_users.py users.jsonl [--batch-size 1000]
+
+Each line needs email, username and hashed_password (a bcrypt hash), and
+may carry full_name, phone, bio, location, avatar_url, is_active,
+is_verified and created_at (ISO 8601).
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from app.core.database import engine, AsyncSessionLocal
+from app.services.users import import_users
+
+
+def read_users(path: Path):
+    """Yield user records from a JSON Lines file."""
+    with path.open(encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            for field in ("email", "username", "hashed_password"):
+                if not record.get(field):
+                    raise ValueError(f"line {line_number}: missing {field}")
+            if record.get("created_at"):
+                record["created_at"] = datetime.fromisoformat(record["created_at"])
+            yield record
+
+
+async def main():
+    """Main import function."""
+    parser = argparse.ArgumentParser(description="Bulk import users")
+    parser.add_argument("path", type=Path, help="JSON Lines file of users")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    print("="*60)
+    print("MultiWeb User Import")
+    print("="*60)
+
+    try:
+        async with AsyncSessionLocal() as session:
+            inserted, skipped = await import_users(
+                session, read_users(args.path), batch_size=args.batch_size
+            )
+            await session.commit()
+
+        print(f"✓ Imported {inserted} users ({skipped} already existed)")
+
+    except Exception as e:
+        print(f"✗ Error during import: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
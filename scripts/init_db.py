@@ -1,26 +1,46 @@
 """
 Database initialization script.
 Creates tables and populates initial data.
+
+Optionally seeds a production-sized synthetic dataset:
+
+    python scripts/init_db.py --seed-size large --seed 42 --workers 8
+
+Seeding streams rows into Postgres with COPY from parallel worker
+processes. Every chunk of rows is generated from its own RNG derived from
+--seed, and ids are assigned from the chunk position, so the same seed
+always produces the same data whatever the worker count.
 """
+import argparse
 import asyncio
+import math
+import os
+import random
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add app to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
 
-from sqlalchemy import select
-from app.core.database import engine, AsyncSessionLocal, Base
+import asyncpg
+from sqlalchemy import select, text
+from app.core.config import settings
+from app.core.database import engine, AsyncSessionLocal, Base, run_migrations
 from app.models import Category, User
 from app.core.security import get_password_hash
 
 
 async def create_tables():
-    """Create all database tables."""
+    """Recreate all database tables from the migrations."""
     print("Creating database tables...")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    await run_migrations()
     print("✓ Tables created successfully")
 
 
@@ -86,8 +106,355 @@ async def create_demo_user():
             print("✓ Demo user already exists")
 
 
+# ---------------------------------------------------------------------------
+# Synthetic data seeding
+# ---------------------------------------------------------------------------
+
+# Number of users per --seed-size; other tables scale from it
+SEED_SIZES = {
+    "small": 10_000,
+    "medium": 100_000,
+    "large": 1_000_000,
+    "xlarge": 5_000_000,
+}
+PRODUCTS_PER_USER = 3
+MAX_IMAGES_PER_PRODUCT = 5
+MAX_MESSAGES_PER_PRODUCT = 4
+CHUNK_ROWS = 20_000  # users or products per COPY chunk
+SEED_PASSWORD = "seed1234!"
+HISTORY_DAYS = 365
+
+# (city, latitude, longitude, share of listings)
+CITIES = [
+    ("Seoul", 37.5665, 126.9780, 0.42),
+    ("Busan", 35.1796, 129.0756, 0.14),
+    ("Incheon", 37.4563, 126.7052, 0.12),
+    ("Daegu", 35.8714, 128.6014, 0.10),
+    ("Daejeon", 36.3504, 127.3845, 0.08),
+    ("Gwangju", 35.1595, 126.8526, 0.07),
+    ("Suwon", 37.2636, 127.0286, 0.05),
+    ("Ulsan", 35.5384, 129.3114, 0.02),
+]
+
+# Median asking price (KRW) per category slug
+CATEGORY_MEDIAN_PRICES = {
+    "electronics": 250_000,
+    "fashion": 35_000,
+    "furniture": 120_000,
+    "books-tickets": 15_000,
+    "sports": 60_000,
+    "baby-kids": 30_000,
+    "beauty": 20_000,
+    "pets": 25_000,
+    "food": 10_000,
+}
+DEFAULT_MEDIAN_PRICE = 30_000
+
+ADJECTIVES = ["Used", "Like-new", "Vintage", "Barely used", "Sealed", "Refurbished", "Classic", "Compact"]
+NOUNS = ["laptop", "jacket", "sofa", "novel", "bicycle", "stroller", "perfume", "cat tower",
+         "coffee beans", "monitor", "sneakers", "desk", "concert ticket", "tent", "car seat"]
+
+# (status, share) - removed is the soft-deleted state
+PRODUCT_STATUSES = [("AVAILABLE", 0.70), ("RESERVED", 0.05), ("SOLD", 0.20), ("REMOVED", 0.05)]
+CONDITIONS = ["NEW", "LIKE_NEW", "GOOD", "FAIR", "POOR"]
+PAYMENT_METHODS = ["CASH", "CARD", "BANK_TRANSFER", "MOBILE_PAYMENT"]
+
+USER_COLUMNS = (
+    "id", "email", "username", "hashed_password", "full_name", "location",
+    "is_active", "is_verified", "role", "rating", "total_reviews", "created_at", "updated_at",
+)
+PRODUCT_COLUMNS = (
+    "id", "title", "description", "price", "original_price", "condition", "status",
+    "category_id", "seller_id", "location", "latitude", "longitude", "views", "likes",
+    "is_featured", "is_negotiable", "slug", "created_at", "updated_at", "sold_at",
+)
+IMAGE_COLUMNS = ("id", "product_id", "url", "thumbnail_url", "order", "is_primary", "created_at")
+TRANSACTION_COLUMNS = (
+    "id", "product_id", "buyer_id", "seller_id", "amount", "payment_method", "status",
+    "created_at", "updated_at", "completed_at",
+)
+MESSAGE_COLUMNS = (
+    "id", "sender_id", "receiver_id", "product_id", "content", "is_read", "created_at",
+)
+
+SEQUENCE_TABLES = ("users", "products", "product_images", "transactions", "messages")
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    """Everything a worker process needs to generate its chunks."""
+    dsn: str
+    seed: int
+    users: int
+    products: int
+    user_base: int
+    product_base: int
+    image_base: int
+    transaction_base: int
+    message_base: int
+    category_ids: tuple[int, ...]
+    category_prices: tuple[int, ...]
+    password_hash: str
+    now: datetime
+
+
+def _chunk_rng(plan: SeedPlan, table: str, chunk: int) -> random.Random:
+    return random.Random(f"{plan.seed}:{table}:{chunk}")
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> list[float]:
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def _skewed_index(rng: random.Random, n: int, skew: float = 3.0) -> int:
+    # Low indexes are picked far more often (power sellers, popular buyers)
+    return min(n - 1, int(n * rng.random() ** skew))
+
+
+def _user_rows(plan: SeedPlan, chunk: int) -> list[tuple]:
+    rng = _chunk_rng(plan, "users", chunk)
+    start = chunk * CHUNK_ROWS
+    rows = []
+    for i in range(start, min(start + CHUNK_ROWS, plan.users)):
+        user_id = plan.user_base + i
+        city = rng.choices(CITIES, weights=[c[3] for c in CITIES])[0][0]
+        created_at = plan.now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400 * 2))
+        rows.append((
+            user_id, f"seed{user_id}@seed.multiweb.dev", f"seed{user_id}", plan.password_hash,
+            f"Seed User {user_id}", city, rng.random() > 0.02, rng.random() < 0.6, "USER",
+            0.0, 0, created_at, created_at,
+        ))
+    return rows
+
+
+def _product_rows(plan: SeedPlan, chunk: int) -> dict[str, list[tuple]]:
+    """Products of one chunk plus their images, transactions and messages."""
+    rng = _chunk_rng(plan, "products", chunk)
+    category_weights = _zipf_weights(len(plan.category_ids))
+    status_names = [status for status, _ in PRODUCT_STATUSES]
+    status_weights = [share for _, share in PRODUCT_STATUSES]
+    city_weights = [c[3] for c in CITIES]
+
+    products, images, transactions, messages = [], [], [], []
+    start = chunk * CHUNK_ROWS
+    for i in range(start, min(start + CHUNK_ROWS, plan.products)):
+        product_id = plan.product_base + i
+        category = rng.choices(range(len(plan.category_ids)), weights=category_weights)[0]
+        seller_id = plan.user_base + _skewed_index(rng, plan.users)
+        status = rng.choices(status_names, weights=status_weights)[0]
+
+        # Log-normal prices around the category median, rounded like real listings
+        price = max(1000, round(plan.category_prices[category] * rng.lognormvariate(0, 0.8), -3))
+        original_price = round(price * rng.uniform(1.2, 2.5), -3) if rng.random() < 0.3 else None
+
+        city, lat, lng, _ = rng.choices(CITIES, weights=city_weights)[0]
+        created_at = plan.now - timedelta(seconds=int(HISTORY_DAYS * 86400 * rng.random() ** 1.5))
+        sold_at = created_at + timedelta(hours=rng.uniform(1, 24 * 14)) if status == "SOLD" else None
+        views = int(rng.paretovariate(1.3) * 10)
+
+        products.append((
+            product_id,
+            f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}",
+            f"Seeded listing {product_id} in {city}.",
+            float(price),
+            float(original_price) if original_price else None,
+            rng.choice(CONDITIONS),
+            status,
+            plan.category_ids[category],
+            seller_id,
+            city,
+            lat + rng.gauss(0, 0.05),
+            lng + rng.gauss(0, 0.05),
+            views,
+            int(views * rng.uniform(0, 0.1)),
+            rng.random() < 0.01,
+            rng.random() < 0.7,
+            f"seed-{product_id}",
+            created_at,
+            sold_at or created_at,
+            sold_at,
+        ))
+
+        for k in range(rng.randint(1, MAX_IMAGES_PER_PRODUCT)):
+            images.append((
+                plan.image_base + i * MAX_IMAGES_PER_PRODUCT + k,
+                product_id,
+                f"https://cdn.multiweb.dev/seed/{product_id}/{k}.jpg",
+                f"https://cdn.multiweb.dev/seed/{product_id}/{k}_thumb.jpg",
+                k,
+                k == 0,
+                created_at,
+            ))
+
+        buyer_id = None
+        if plan.users > 1 and (status in ("SOLD", "RESERVED") or rng.random() < 0.3):
+            buyer_id = seller_id
+            while buyer_id == seller_id:
+                buyer_id = plan.user_base + _skewed_index(rng, plan.users, skew=1.5)
+
+        if buyer_id is not None and status in ("SOLD", "RESERVED"):
+            ordered_at = created_at + timedelta(hours=rng.uniform(0.5, 24 * 7))
+            transactions.append((
+                plan.transaction_base + i,
+                product_id,
+                buyer_id,
+                seller_id,
+                float(price),
+                rng.choice(PAYMENT_METHODS),
+                "COMPLETED" if status == "SOLD" else "PENDING",
+                ordered_at,
+                sold_at or ordered_at,
+                sold_at,
+            ))
+
+        if buyer_id is not None:
+            sent_at = created_at
+            for k in range(rng.randint(1, MAX_MESSAGES_PER_PRODUCT)):
+                sent_at += timedelta(minutes=rng.uniform(1, 600))
+                sender, receiver = (buyer_id, seller_id) if k % 2 == 0 else (seller_id, buyer_id)
+                messages.append((
+                    plan.message_base + i * MAX_MESSAGES_PER_PRODUCT + k,
+                    sender,
+                    receiver,
+                    product_id,
+                    "Is this still available?" if k == 0 else "Sounds good, see you then.",
+                    rng.random() < 0.8,
+                    sent_at,
+                ))
+
+    return {
+        "products": products,
+        "product_images": images,
+        "transactions": transactions,
+        "messages": messages,
+    }
+
+
+TABLE_COLUMNS = {
+    "users": USER_COLUMNS,
+    "products": PRODUCT_COLUMNS,
+    "product_images": IMAGE_COLUMNS,
+    "transactions": TRANSACTION_COLUMNS,
+    "messages": MESSAGE_COLUMNS,
+}
+
+
+async def _copy_chunk(plan: SeedPlan, phase: str, chunk: int) -> int:
+    if phase == "users":
+        tables = {"users": _user_rows(plan, chunk)}
+    else:
+        tables = _product_rows(plan, chunk)
+
+    conn = await asyncpg.connect(plan.dsn)
+    try:
+        async with conn.transaction():
+            # Parents before children, so the chunk satisfies its own FKs
+            for table, rows in tables.items():
+                if rows:
+                    await conn.copy_records_to_table(
+                        table, records=rows, columns=TABLE_COLUMNS[table]
+                    )
+    finally:
+        await conn.close()
+    return sum(len(rows) for rows in tables.values())
+
+
+def _run_chunk(plan: SeedPlan, phase: str, chunk: int) -> int:
+    """Worker process entry point."""
+    return asyncio.run(_copy_chunk(plan, phase, chunk))
+
+
+async def _next_id(conn: asyncpg.Connection, table: str) -> int:
+    return await conn.fetchval(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+
+
+async def seed_synthetic_data(users: int, seed: int, workers: int):
+    """
+    Seed a synthetic dataset of the given size with COPY.
+
+    Args:
+        users: Number of users; products, images, transactions and
+            messages scale from it
+        seed: RNG seed; the same seed always produces the same rows
+        workers: Parallel worker processes
+    """
+    products = users * PRODUCTS_PER_USER
+    print(f"Seeding {users:,} users and {products:,} products (seed={seed}, workers={workers})...")
+
+    dsn = str(settings.DATABASE_URL).replace("postgresql+asyncpg://", "postgresql://")
+    conn = await asyncpg.connect(dsn)
+    try:
+        categories = await conn.fetch('SELECT id, slug FROM categories ORDER BY "order", id')
+        if not categories:
+            raise RuntimeError("no categories to seed products into")
+        plan = SeedPlan(
+            dsn=dsn,
+            seed=seed,
+            users=users,
+            products=products,
+            user_base=await _next_id(conn, "users"),
+            product_base=await _next_id(conn, "products"),
+            image_base=await _next_id(conn, "product_images"),
+            transaction_base=await _next_id(conn, "transactions"),
+            message_base=await _next_id(conn, "messages"),
+            category_ids=tuple(row["id"] for row in categories),
+            category_prices=tuple(
+                CATEGORY_MEDIAN_PRICES.get(row["slug"], DEFAULT_MEDIAN_PRICE) for row in categories
+            ),
+            # One bcrypt hash for everyone; hashing millions would take hours
+            password_hash=get_password_hash(SEED_PASSWORD),
+            now=datetime.utcnow().replace(microsecond=0),
+        )
+    finally:
+        await conn.close()
+
+    # Workers fork from this process; don't hand them live pooled connections
+    await engine.dispose()
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Users first: every product chunk references them
+        for phase, total in (("users", users), ("products", products)):
+            started_at = time.perf_counter()
+            chunks = math.ceil(total / CHUNK_ROWS)
+            rows = await asyncio.gather(*(
+                loop.run_in_executor(pool, _run_chunk, plan, phase, chunk)
+                for chunk in range(chunks)
+            ))
+            elapsed = time.perf_counter() - started_at
+            print(f"✓ {phase}: {sum(rows):,} rows in {elapsed:.1f}s "
+                  f"({sum(rows) / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        # Ids were assigned explicitly; move the sequences past them
+        for table in SEQUENCE_TABLES:
+            await conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+            )
+        print("Analyzing...")
+        await conn.execute("ANALYZE")
+    finally:
+        await conn.close()
+
+    print(f"✓ Seed users can log in with password {SEED_PASSWORD!r}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Initialize the MultiWeb database")
+    parser.add_argument("--seed-size", choices=sorted(SEED_SIZES), help="seed a synthetic dataset")
+    parser.add_argument("--users", type=int, help="seed exactly this many users (overrides --seed-size)")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed for synthetic data")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="parallel COPY worker processes")
+    return parser.parse_args()
+
+
 async def main():
     """Main initialization function."""
+    args = parse_args()
+
     print("="*60)
     print("MultiWeb Database Initialization")
     print("="*60)
@@ -97,6 +464,10 @@ async def main():
         await create_initial_categories()
         await create_demo_user()
 
+        seed_users = args.users or SEED_SIZES.get(args.seed_size)
+        if seed_users:
+            await seed_synthetic_data(seed_users, args.seed, max(1, args.workers))
+
         print("="*60)
         print("✓ Database initialization completed successfully!")
         print("="*60)
@@ -210,8 +210,15 @@ fi
 
 cd ../scripts
 
+# Run schema migrations before the API starts
+kubectl delete job multiweb-db-migrate -n multiweb --ignore-not-found
+kubectl apply -f ../k8s/base/jobs.yaml
+echo "Waiting for schema migrations..."
+kubectl wait --for=condition=complete job/multiweb-db-migrate -n multiweb --timeout=300s
+
 # Deploy application
 kubectl apply -f ../k8s/base/api.yaml
+kubectl apply -f ../k8s/base/outbox-relay.yaml
 kubectl apply -f ../k8s/ingress/ingress.yaml
 
 # Wait for application
@@ -339,6 +339,51 @@ class BruteForceSimulator(AttackSimulator):
 
         self.print_summary()
 
+    async def spoofed_ip_login(self, attempts: int = 50):
+        """
+        Simulate credential stuffing that forges X-Real-IP on every request.
+
+        Run against the API port directly (not through nginx). The forged
+        header must be ignored, so the per-IP auth rate limit and login
+        lockout still apply and later attempts get 429.
+
+        Args:
+            attempts: Number of login attempts
+        """
+        print("\n[Brute Force] Testing X-Real-IP spoofing...")
+        print(f"Attempts: {attempts}")
+
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            for i in range(attempts):
+                # A different email each time, so only the per-IP limits apply
+                login_data = {
+                    "email": fake.email(),
+                    "password": f"password{i}",
+                }
+
+                try:
+                    response = await client.post(
+                        f"{self.base_url}/api/v1/auth/login",
+                        json=login_data,
+                        headers={"X-Real-IP": fake.ipv4_public()},
+                    )
+                    self.results["total_requests"] += 1
+
+                    if response.status_code == 429:
+                        self.results["rate_limited"] += 1
+                    else:
+                        self.results["blocked"] += 1
+
+                except Exception:
+                    self.results["failed"] += 1
+
+        if self.results["rate_limited"]:
+            print("[+] Forged X-Real-IP ignored; per-IP limits still apply")
+        else:
+            print("[!] Never rate limited: X-Real-IP from an untrusted peer is honoured")
+
+        self.print_summary()
+
 
 async def main():
     """Run all attack simulations."""
@@ -367,6 +412,9 @@ async def main():
     brute = BruteForceSimulator(base_url)
     await brute.brute_force_login(attempts=50)
 
+    spoof = BruteForceSimulator(base_url)
+    await spoof.spoofed_ip_login(attempts=50)
+
     print("\n" + "="*60)
     print("ALL SIMULATIONS COMPLETED")
     print("="*60)
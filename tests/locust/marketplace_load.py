@@ -193,7 +193,7 @@ class MarketplaceUser(HttpUser):
             catch_response=True,
             name="/api/v1/transactions/ [create]"
         ) as response:
-            if response.status_code in [201, 400, 401, 404]:
+            if response.status_code in [201, 400, 401, 404, 409]:
                 response.success()
 
     @task(2)
@@ -0,0 +1,161 @@
+"""
+Locust contention test for product reservation.
+Many buyers race to purchase the same freshly listed product; exactly one
+purchase per product must succeed and the rest must be rejected with 409.
+
+Run it against an API started with RATE_LIMIT_ENABLED=false:
+
+    RATE_LIMIT_ENABLED=false docker compose up -d api
+
+Every simulated user registers and logs in from the load generator's one
+IP, well past the per-IP auth burst, and buyers post several times a
+second against a per-user write limit of 30/min. With rate limiting on,
+most requests get 429 and the run measures the rate limiter instead of
+the reservation. 429 responses are counted separately and fail the run.
+
+Usage:
+    locust -f reservation_contention.py --host http://localhost:8000 \
+        --users 101 --spawn-rate 101 --run-time 2m --headless
+"""
+import random
+import threading
+from collections import defaultdict
+from locust import HttpUser, task, between, constant, events
+from faker import Faker
+
+fake = Faker()
+
+# Product currently being fought over, published by the seller
+hot_product = {"id": None, "price": None}
+
+# product_id -> number of successful purchases
+purchases = defaultdict(int)
+purchases_lock = threading.Lock()
+
+# Requests rejected by the API rate limiter (should stay 0, see above)
+rate_limited = {"count": 0}
+
+RATE_LIMITED = "Rate limited (429): run the API with RATE_LIMIT_ENABLED=false"
+
+
+def count_rate_limited():
+    with purchases_lock:
+        rate_limited["count"] += 1
+
+
+def register_and_login(client) -> str | None:
+    """Register a throwaway account and return its access token."""
+    email = fake.unique.email()
+    password = "Test123456!"
+
+    client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "username": fake.user_name() + str(random.randint(100000, 999999)),
+            "password": password,
+        },
+        name="/api/v1/auth/register",
+    )
+
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": password},
+        name="/api/v1/auth/login",
+    )
+    if response.status_code == 200:
+        return response.json()["access_token"]
+    if response.status_code == 429:
+        count_rate_limited()
+    return None
+
+
+class SellerUser(HttpUser):
+    """Keeps listing new hot products for buyers to fight over."""
+
+    fixed_count = 1
+    wait_time = constant(2)
+
+    def on_start(self):
+        self.auth_token = register_and_login(self.client)
+
+    @task
+    def list_hot_product(self):
+        if not self.auth_token:
+            return
+
+        with self.client.post(
+            "/api/v1/products/",
+            json={
+                "title": f"Hot item {fake.word()} {random.randint(1, 10**9)}",
+                "description": fake.text(max_nb_chars=200),
+                "price": round(random.uniform(10, 1000), 2),
+                "condition": "like_new",
+                "category_id": random.randint(1, 10),
+            },
+            headers={"Authorization": f"Bearer {self.auth_token}"},
+            catch_response=True,
+            name="/api/v1/products/ [create hot]",
+        ) as response:
+            if response.status_code == 201:
+                data = response.json()
+                hot_product["id"] = data["id"]
+                hot_product["price"] = data["price"]
+                response.success()
+
+
+class BuyerUser(HttpUser):
+    """Tries to buy whatever product is currently hot."""
+
+    wait_time = between(0.05, 0.2)
+
+    def on_start(self):
+        self.auth_token = register_and_login(self.client)
+
+    @task
+    def buy_hot_product(self):
+        product_id = hot_product["id"]
+        if not self.auth_token or product_id is None:
+            return
+
+        with self.client.post(
+            "/api/v1/transactions/",
+            json={
+                "product_id": product_id,
+                "amount": hot_product["price"],
+                "payment_method": "card",
+            },
+            headers={"Authorization": f"Bearer {self.auth_token}"},
+            catch_response=True,
+            name="/api/v1/transactions/ [contended]",
+        ) as response:
+            if response.status_code == 201:
+                with purchases_lock:
+                    purchases[product_id] += 1
+                response.success()
+            elif response.status_code == 409:
+                # Lost the race - expected for all but one buyer
+                response.success()
+            elif response.status_code == 429:
+                count_rate_limited()
+                response.failure(RATE_LIMITED)
+            else:
+                response.failure(f"Unexpected status {response.status_code}")
+
+
+@events.test_stop.add_listener
+def on_test_stop(environment, **kwargs):
+    """Fail the run if any product was sold more than once or any request was rate limited."""
+    oversold = {pid: count for pid, count in purchases.items() if count > 1}
+
+    print(f"Products sold: {len(purchases)}")
+    print(f"Oversold products: {len(oversold)}")
+    print(f"Rate limited requests: {rate_limited['count']}")
+
+    if oversold:
+        print(f"Oversold detail: {oversold}")
+        environment.process_exit_code = 1
+
+    if rate_limited["count"]:
+        print(RATE_LIMITED)
+        environment.process_exit_code = 1